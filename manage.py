@@ -28,3 +28,7 @@ def run_test_cov():
 
 def run_test_cov_html():
     subprocess.run(["bash", "scripts/test-cov-html.sh", *_parse_args()])
+
+
+def run_benchmark():
+    subprocess.run(["bash", "scripts/benchmark.sh", *_parse_args()])
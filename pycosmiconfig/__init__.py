@@ -1,14 +1,93 @@
+from typing import TYPE_CHECKING, Any, List
+
+from pycosmiconfig.caches import (
+    CacheFactory,
+    CacheOption,
+    CachePolicy,
+    CacheProtocol,
+    CacheStats,
+    LRUCache,
+)
 from pycosmiconfig.port.types import (
     Config,
+    ConfigChange,
     CosmiconfigResult,
     LoaderResult,
     Loader,
     Loaders,
     Transform,
+    AsyncLoader,
+    AsyncLoaders,
+    AsyncTransform,
     Options,
     PublicExplorer,
     PublicExplorerLoadFn,
+    PublicExplorerSearchAllFn,
     PublicExplorerSearchFn,
+    PublicExplorerSearchManyFn,
+)
+from pycosmiconfig.port.loaders import (
+    load_py,
+    load_json,
+    load_toml,
+    load_yaml,
+    ParserBackend,
+    get_available_parser_backends,
+    get_parser_backend,
+    set_parser_backend,
+)
+from pycosmiconfig.port.index import (
+    meta_search_places,
+    default_loaders,
+    cosmiconfig,
+    cosmiconfig_async,
+)
+from pycosmiconfig.instrumentation import (
+    EventSink,
+    ExplorerEvent,
+    ExplorerStats,
 )
-from pycosmiconfig.port.loaders import load_py, load_json, load_toml, load_yaml
-from pycosmiconfig.port.index import meta_search_places, default_loaders, cosmiconfig
+
+# Only needed with the `watch` and `freeze_configs` options, so imported on
+# first access, to keep importing pycosmiconfig cheap
+if TYPE_CHECKING:
+    from pycosmiconfig.watchers import (
+        InotifyWatcher,
+        PollingWatcher,
+        Watcher,
+        WatchCallback,
+    )
+    from pycosmiconfig.frozen import (
+        Frozen,
+        FrozenDict,
+        FrozenList,
+        freeze,
+        thaw,
+    )
+
+_lazy_exports = {
+    "InotifyWatcher": "pycosmiconfig.watchers",
+    "PollingWatcher": "pycosmiconfig.watchers",
+    "Watcher": "pycosmiconfig.watchers",
+    "WatchCallback": "pycosmiconfig.watchers",
+    "Frozen": "pycosmiconfig.frozen",
+    "FrozenDict": "pycosmiconfig.frozen",
+    "FrozenList": "pycosmiconfig.frozen",
+    "freeze": "pycosmiconfig.frozen",
+    "thaw": "pycosmiconfig.frozen",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _lazy_exports.get(name, None)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted([*globals(), *_lazy_exports])
@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+
+from trees import Tree, config_files, create_tree
+
+tree_defaults: Dict[str, Any] = {
+    "tree_depth": 6,
+    "tree_breadth": 3,
+    "tree_formats": "json,yaml,toml,pyproject,noExt",
+    "tree_config_every": 3,
+}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("pycosmiconfig benchmarks")
+    group.addoption("--tree-depth", type=int, default=tree_defaults["tree_depth"])
+    group.addoption("--tree-breadth", type=int, default=tree_defaults["tree_breadth"])
+    group.addoption(
+        "--tree-formats",
+        default=tree_defaults["tree_formats"],
+        help=f"Comma-separated config formats, of: {', '.join(config_files)}",
+    )
+    group.addoption(
+        "--tree-config-every",
+        type=int,
+        default=tree_defaults["tree_config_every"],
+        help="Put config files on every n-th level of the tree",
+    )
+
+
+@pytest.fixture(scope="session")
+def tree(request: pytest.FixtureRequest, tmp_path_factory) -> Tree:
+    """Synthetic directory tree, shared by all benchmarks."""
+    # Options are only registered if pytest was pointed to this directory
+    options = {
+        name: request.config.getoption(name, default=default)
+        for name, default in tree_defaults.items()
+    }
+    formats = options["tree_formats"].split(",")
+    unknown = set(formats) - set(config_files)
+    if unknown:
+        raise pytest.UsageError(f"Unknown --tree-formats: {', '.join(unknown)}")
+
+    # Resolved, as the temp dir may be a symlink (macOS)
+    root = Path(tmp_path_factory.mktemp("tree")).resolve()
+    return create_tree(
+        root,
+        depth=options["tree_depth"],
+        breadth=options["tree_breadth"],
+        formats=formats,
+        config_every=options["tree_config_every"],
+    )
+
+
+@pytest.fixture(autouse=True)
+def in_tree_root(tree: Tree, monkeypatch: pytest.MonkeyPatch) -> None:
+    # Meta config is searched for in the working directory
+    monkeypatch.chdir(tree.root)
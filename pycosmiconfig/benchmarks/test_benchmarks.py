@@ -0,0 +1,193 @@
+import gc
+import os
+import statistics
+import subprocess
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from pycosmiconfig import cosmiconfig
+from pycosmiconfig.port.ExplorerBase import pyproject_documents
+from pycosmiconfig.port.ExplorerSync import ExplorerSync
+from trees import MODULE_NAME, Tree, config_files, create_tree
+
+pytest.importorskip("pytest_benchmark")
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+
+def create_explorer(tree: Tree, **options) -> ExplorerSync:
+    return cosmiconfig(MODULE_NAME, stop_dir=str(tree.root), **options)
+
+
+def search_leaves(explorer: ExplorerSync, leaves: List[Path]) -> None:
+    for leaf in leaves:
+        assert explorer.search(str(leaf)) is not None
+
+
+def describe_search():
+    def test_cold(benchmark, tree: Tree):
+        """Search from every leaf with a new explorer, i.e. empty caches."""
+
+        def setup():
+            # Parsed `pyproject.toml` files are shared across explorers
+            pyproject_documents.clear()
+            return (create_explorer(tree), tree.leaves), {}
+
+        benchmark.extra_info["searches"] = len(tree.leaves)
+        benchmark.pedantic(search_leaves, setup=setup, rounds=10)
+
+    def test_warm(benchmark, tree: Tree):
+        """Search from every leaf again, served from the search cache."""
+        explorer = create_explorer(tree)
+        search_leaves(explorer, tree.leaves)
+
+        benchmark.extra_info["searches"] = len(tree.leaves)
+        benchmark(search_leaves, explorer, tree.leaves)
+
+    def test_warm_validated(benchmark, tree: Tree):
+        """Same as `test_warm`, but each hit is checked against the filesystem."""
+        explorer = create_explorer(tree, validate_cache=True)
+        search_leaves(explorer, tree.leaves)
+
+        benchmark.extra_info["searches"] = len(tree.leaves)
+        benchmark(search_leaves, explorer, tree.leaves)
+
+    def test_uncached(benchmark, tree: Tree):
+        explorer = create_explorer(tree, cache=False)
+
+        benchmark.extra_info["searches"] = len(tree.leaves)
+        benchmark(search_leaves, explorer, tree.leaves)
+
+    def test_search_many(benchmark, tree: Tree):
+        def setup():
+            pyproject_documents.clear()
+            leaves = [str(leaf) for leaf in tree.leaves]
+            return (create_explorer(tree), leaves), {}
+
+        benchmark.extra_info["searches"] = len(tree.leaves)
+        benchmark.pedantic(
+            lambda explorer, leaves: explorer.search_many(leaves, max_workers=8),
+            setup=setup,
+            rounds=10,
+        )
+
+
+@pytest.mark.parametrize("file_format", list(config_files))
+def test_load(benchmark, tmp_path: Path, file_format: str):
+    """Read and parse one config file of each format, without caches."""
+    filename, content = config_files[file_format]
+    filepath = tmp_path / filename
+    filepath.write_text(content)
+    explorer = cosmiconfig(MODULE_NAME, stop_dir=str(tmp_path), cache=False)
+
+    def load():
+        pyproject_documents.clear()
+        return explorer.load(str(filepath))
+
+    result = benchmark(load)
+    assert result.config["items"] == [1, 2, 3]
+
+
+def run_new_interpreter(code: str, cwd: Path) -> int:
+    """
+    Runs `code` in a new interpreter. Returns the cumulative import time of
+    pycosmiconfig (in microseconds), as reported by `-X importtime`.
+    """
+    env = {**os.environ, "PYTHONPATH": str(ROOT_DIR)}
+    # Measured with compiled bytecode, as for an installed package
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(cwd),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in process.stderr.splitlines():
+        _, _, module = line.rpartition("|")
+        if module.strip() == "pycosmiconfig":
+            return int(line.split("|")[1])
+    raise AssertionError(f"pycosmiconfig was not imported:\n{process.stderr}")
+
+
+def benchmark_new_interpreter(benchmark, code: str, cwd: Path) -> None:
+    # Compiles the bytecode
+    run_new_interpreter(code, cwd)
+    import_times: List[int] = []
+
+    benchmark.pedantic(
+        lambda: import_times.append(run_new_interpreter(code, cwd)), rounds=20
+    )
+    benchmark.extra_info["import_time_us"] = statistics.median(import_times)
+
+
+def describe_startup():
+    def test_import(benchmark, tmp_path: Path):
+        """
+        `import pycosmiconfig` in a new interpreter. The measured time includes
+        the startup of the interpreter, the median import time of the package
+        alone is reported in `extra_info`.
+        """
+        benchmark_new_interpreter(benchmark, "import pycosmiconfig", tmp_path)
+
+    @pytest.mark.parametrize("file_format", ["json", "pyproject"])
+    def test_first_search(benchmark, tmp_path: Path, file_format: str):
+        """
+        Import, create an explorer, and search once in a new interpreter, i.e.
+        the startup cost that pycosmiconfig adds to a CLI tool.
+        """
+        filename, content = config_files[file_format]
+        (tmp_path / filename).write_text(content)
+        code = (
+            "from pycosmiconfig import cosmiconfig\n"
+            f"explorer = cosmiconfig({MODULE_NAME!r}, stop_dir={str(tmp_path)!r})\n"
+            "assert explorer.search()\n"
+        )
+
+        benchmark_new_interpreter(benchmark, code, tmp_path)
+
+
+def test_construction(benchmark, tree: Tree):
+    """Cost of `cosmiconfig()`, with the meta config lookup already cached."""
+    create_explorer(tree)
+
+    benchmark(create_explorer, tree)
+
+
+def test_memory_per_cached_entry(benchmark, tmp_path: Path):
+    """
+    Memory held by the caches of an explorer per cached search result.
+    Reported in `extra_info`. Fails if it grows far beyond the expected size.
+    """
+    tree = create_tree(
+        tmp_path.resolve(), depth=3, breadth=8, formats=["json"], config_every=2
+    )
+    explorer = create_explorer(tree)
+    # Not part of the measurement
+    explorer.search(str(tree.root))
+
+    def measure() -> float:
+        explorer.clear_caches()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            search_leaves(explorer, tree.leaves)
+            gc.collect()
+            after = tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+        entries = sum(stats.size for stats in explorer.cache_stats().values())
+        return (after - before) / entries
+
+    bytes_per_entry = benchmark.pedantic(measure, rounds=3)
+    benchmark.extra_info["bytes_per_entry"] = round(bytes_per_entry)
+    benchmark.extra_info["entries"] = sum(
+        stats.size for stats in explorer.cache_stats().values()
+    )
+    assert bytes_per_entry < 8 * 1024
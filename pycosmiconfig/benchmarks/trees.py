@@ -0,0 +1,89 @@
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+MODULE_NAME = "foo"
+
+# File name and content of a config file in each format
+config_files: Dict[str, Tuple[str, str]] = {
+    "json": (
+        f".{MODULE_NAME}rc.json",
+        '{"name": "json", "items": [1, 2, 3], "nested": {"a": true, "b": null}}',
+    ),
+    "yaml": (
+        f".{MODULE_NAME}rc.yaml",
+        "name: yaml\nitems: [1, 2, 3]\nnested:\n  a: true\n  b: null\n",
+    ),
+    "toml": (
+        f".{MODULE_NAME}rc.toml",
+        'name = "toml"\nitems = [1, 2, 3]\n[nested]\na = true\n',
+    ),
+    "pyproject": (
+        "pyproject.toml",
+        '[project]\nname = "pkg"\nversion = "1.0.0"\n'
+        "[tool.black]\nline-length = 88\n"
+        f'[tool.{MODULE_NAME}]\nname = "pyproject"\nitems = [1, 2, 3]\n'
+        f"[tool.{MODULE_NAME}.nested]\na = true\n",
+    ),
+    "py": (
+        f".{MODULE_NAME}rc.py",
+        'config = {"name": "py", "items": [1, 2, 3], "nested": {"a": True}}\n',
+    ),
+    "noExt": (
+        f".{MODULE_NAME}rc",
+        "name: noExt\nitems: [1, 2, 3]\n",
+    ),
+}
+"""Formats that trees can be generated with, by name."""
+
+
+class Tree(NamedTuple):
+    root: Path
+    # Deepest directories, where searches start from
+    leaves: List[Path]
+    configs: List[Path]
+    dir_count: int
+
+
+def create_tree(
+    root: Path,
+    depth: int,
+    breadth: int,
+    formats: Sequence[str],
+    config_every: int = 2,
+) -> Tree:
+    """
+    Creates a tree of directories in `root`, `depth` levels deep, in which
+    each directory has `breadth` subdirectories.
+
+    Every `config_every`-th level (starting with `root`) has a config file in
+    each directory, in a format picked from `formats` in turn. The deepest
+    level has none, so that searches from there walk up a few directories.
+    Each directory also has a few unrelated files, so that directory listings
+    aren't trivial.
+    """
+    leaves: List[Path] = []
+    configs: List[Path] = []
+    dir_count = 0
+    level_dirs = [root]
+    for level in range(depth + 1):
+        next_level_dirs: List[Path] = []
+        for directory in level_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            dir_count += 1
+            for name in ["README.md", "main.py", ".gitignore"]:
+                (directory / name).write_text("")
+
+            if level < depth and level % config_every == 0:
+                file_format = formats[len(configs) % len(formats)]
+                filename, content = config_files[file_format]
+                configs.append(directory / filename)
+                configs[-1].write_text(content)
+
+            if level == depth:
+                leaves.append(directory)
+            else:
+                next_level_dirs.extend(
+                    directory / f"dir{index}" for index in range(breadth)
+                )
+        level_dirs = next_level_dirs
+    return Tree(root=root, leaves=leaves, configs=configs, dir_count=dir_count)
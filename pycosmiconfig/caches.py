@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Hashable,
+    Iterator,
+    NamedTuple,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+    Union,
+    runtime_checkable,
+)
+
+from pycosmiconfig.port.util import MISSING
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class CacheStats(NamedTuple):
+    """
+    @public
+
+    Counters of a cache. `evictions` counts entries dropped because the cache
+    was full or the entry expired, not entries removed by `clear()`.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+@runtime_checkable
+class CacheProtocol(Protocol):
+    """
+    @public
+
+    Methods that explorers use on their caches. A `dict` satisfies it.
+    """
+
+    # Arguments are positional-only (named with `__`), like those of `dict`.
+    # Explorers always pass the default of `get()`.
+
+    def get(self, __key: Any, __default: Any) -> Any:
+        ...
+
+    def __setitem__(self, __key: Any, __value: Any) -> None:
+        ...
+
+    def __delitem__(self, __key: Any) -> None:
+        ...
+
+    def __contains__(self, __key: object) -> bool:
+        ...
+
+    def __len__(self) -> int:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+CacheFactory = Callable[[], CacheProtocol]
+"""@public"""
+
+
+class LRUCache(Generic[K, V]):
+    """
+    @public
+
+    Thread-safe dict-like cache that holds at most `max_entries` entries,
+    evicting the least recently used entry when full. Entries older than
+    `ttl` seconds are treated as missing. `None` means no limit.
+    """
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        # Values are stored with the time they expire at (or `None`)
+        self._entries: "OrderedDict[K, Tuple[V, Optional[float]]]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: K, default: Any = None) -> Any:
+        with self._lock:
+            value = self._get(key)
+            if value is MISSING:
+                self._misses += 1
+                return default
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return value
+
+    def __setitem__(self, key: K, value: V) -> None:
+        with self._lock:
+            expires_at = None if self.ttl is None else self._clock() + self.ttl
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+    def __getitem__(self, key: K) -> V:
+        value = self.get(key, MISSING)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __delitem__(self, key: K) -> None:
+        with self._lock:
+            del self._entries[key]
+
+    def __contains__(self, key: object) -> bool:
+        with self._lock:
+            return self._get(key) is not MISSING
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[K]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def pop(self, key: K, default: Any = None) -> Any:
+        with self._lock:
+            value = self._get(key)
+            if value is MISSING:
+                return default
+            del self._entries[key]
+            return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+            )
+
+    def _get(self, key: Any) -> Any:
+        # Must be called with the lock held
+        entry = self._entries.get(key, None)
+        if entry is None:
+            return MISSING
+        value, expires_at = entry
+        if expires_at is not None and self._clock() >= expires_at:
+            del self._entries[key]
+            self._evictions += 1
+            return MISSING
+        return value
+
+
+class CachePolicy:
+    """
+    @public
+
+    Bounds each cache of an explorer to `max_entries` entries (evicting the
+    least recently used ones) and/or expires entries after `ttl` seconds.
+    """
+
+    __slots__ = ("max_entries", "ttl")
+
+    def __init__(
+        self, max_entries: Optional[int] = None, ttl: Optional[float] = None
+    ) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Fail early on invalid values
+        self.create_cache()
+
+    def create_cache(self) -> LRUCache:
+        return LRUCache(max_entries=self.max_entries, ttl=self.ttl)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, CachePolicy):
+            return NotImplemented
+        return (self.max_entries, self.ttl) == (other.max_entries, other.ttl)
+
+    def __repr__(self) -> str:
+        return f"CachePolicy(max_entries={self.max_entries}, ttl={self.ttl})"
+
+
+CacheOption = Union[bool, int, CachePolicy, CacheFactory]
+"""@public"""
+
+
+def get_cache_factory(cache: Optional[CacheOption]) -> Optional[CacheFactory]:
+    """
+    @internal
+
+    Returns the function that creates the explorer's caches for the `cache`
+    option, or `None` if caching is disabled.
+    """
+    if cache is None or cache is False:
+        return None
+    if cache is True:
+        return LRUCache
+    if isinstance(cache, int):
+        return CachePolicy(max_entries=cache).create_cache
+    if isinstance(cache, CachePolicy):
+        return cache.create_cache
+    if callable(cache):
+        return cache
+    raise TypeError(
+        "cache must be a bool, an int, a CachePolicy or a function that "
+        f"returns a cache: Received {type(cache).__name__}."
+    )
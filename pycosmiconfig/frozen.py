@@ -0,0 +1,190 @@
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# Types of most values in configs, which are immutable and need no conversion.
+# Checked before anything else, as most values are of these types.
+_SCALAR_TYPES = frozenset([str, int, float, bool, type(None)])
+
+
+class FrozenDict(Mapping):
+    """
+    @public
+
+    Read-only, hashable view of a dict of frozen values. Compares equal to
+    dicts with equal items. Hashable if all its values are.
+    """
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        data = dict(*args, **kwargs)
+        self._data: Dict[Any, Any] = {key: freeze(value) for key, value in data.items()}
+        self._hash: Optional[int] = None
+
+    @classmethod
+    def _wrap(cls, data: Dict[Any, Any]) -> "FrozenDict":
+        # `data` is owned by the view, and its values are already frozen
+        view = cls.__new__(cls)
+        view._data = data
+        view._hash = None
+        return view
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenDict):
+            return self._data == other._data
+        if isinstance(other, Mapping):
+            return self._data == dict(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"FrozenDict({self._data!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FrozenDict, (self._data,))
+
+    # Immutable, so copies can be the view itself
+    def __copy__(self) -> "FrozenDict":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenDict":
+        return self
+
+    def thaw(self) -> Dict[Any, Any]:
+        """Returns a mutable (deep) copy as a `dict`."""
+        return {
+            key: value if type(value) in _SCALAR_TYPES else thaw(value)
+            for key, value in self._data.items()
+        }
+
+
+class FrozenList(Sequence):
+    """
+    @public
+
+    Read-only, hashable view of a list of frozen values. Compares equal to
+    lists and tuples with equal items. Hashable if all its items are.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Any = ()) -> None:
+        self._items: Tuple[Any, ...] = tuple(freeze(item) for item in items)
+
+    @classmethod
+    def _wrap(cls, items: Tuple[Any, ...]) -> "FrozenList":
+        # Items are already frozen
+        view = cls.__new__(cls)
+        view._items = items
+        return view
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return FrozenList._wrap(self._items[index])
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._items
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, FrozenList):
+            return self._items == other._items
+        if isinstance(other, (list, tuple)):
+            return self._items == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._items)
+
+    def __repr__(self) -> str:
+        return f"FrozenList({list(self._items)!r})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (FrozenList, (self._items,))
+
+    def __copy__(self) -> "FrozenList":
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "FrozenList":
+        return self
+
+    def thaw(self) -> List[Any]:
+        """Returns a mutable (deep) copy as a `list`."""
+        return [
+            item if type(item) in _SCALAR_TYPES else thaw(item) for item in self._items
+        ]
+
+
+Frozen = Union[FrozenDict, FrozenList]
+"""@public"""
+
+
+def freeze(value: Any) -> Any:
+    """
+    @public
+
+    Converts dicts, lists and sets in `value` (recursively) to `FrozenDict`,
+    `FrozenList` and `frozenset`. Other values, and values that are already
+    frozen, are returned as they are, so freezing a frozen config is cheap.
+    """
+    if type(value) in _SCALAR_TYPES or isinstance(
+        value, (FrozenDict, FrozenList, frozenset)
+    ):
+        return value
+    if isinstance(value, dict):
+        return FrozenDict._wrap(
+            {
+                key: item if type(item) in _SCALAR_TYPES else freeze(item)
+                for key, item in value.items()
+            }
+        )
+    if isinstance(value, list):
+        return FrozenList._wrap(
+            tuple(
+                [
+                    item if type(item) in _SCALAR_TYPES else freeze(item)
+                    for item in value
+                ]
+            )
+        )
+    if isinstance(value, set):
+        return frozenset(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """
+    @public
+
+    Returns a mutable copy of a value frozen with `freeze()`: `FrozenDict` and
+    `FrozenList` become `dict` and `list` (recursively). Other values are
+    returned as they are.
+    """
+    if isinstance(value, (FrozenDict, FrozenList)):
+        return value.thaw()
+    return value
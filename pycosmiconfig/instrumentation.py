@@ -0,0 +1,120 @@
+import threading
+from collections import defaultdict
+from typing import Callable, DefaultDict, Dict, NamedTuple, Optional
+
+# Kinds of `ExplorerEvent`
+DIR_VISITED = "dir_visited"
+"""A directory was searched for config files."""
+FILE_PROBED = "file_probed"
+"""A search place was found in a directory listing, and is about to be read."""
+FILE_READ = "file_read"
+"""A file was read. `duration` is the time taken to read it."""
+PARSE = "parse"
+"""A loader parsed a file. `loader` is its name, `duration` the time taken."""
+TRANSFORM = "transform"
+"""A result was transformed. `path` is empty if nothing was found."""
+CACHE_HIT = "cache_hit"
+"""A result was served from the cache named `cache`."""
+CACHE_MISS = "cache_miss"
+"""A result was computed and stored in the cache named `cache`."""
+
+
+class ExplorerEvent(NamedTuple):
+    """
+    @public
+
+    Passed to the `instrument` callback. `duration` is in seconds.
+    """
+
+    kind: str
+    path: str
+    duration: Optional[float] = None
+    loader: Optional[str] = None
+    cache: Optional[str] = None
+
+
+EventSink = Callable[[ExplorerEvent], None]
+"""@public"""
+
+
+class ExplorerStats(NamedTuple):
+    """
+    @public
+
+    Totals of the events of an explorer since it was created. Times are in
+    seconds. `parses` and `parse_time` are per loader name, `cache_hits` and
+    `cache_misses` per cache (`"load"`, `"search"`, `"meta_config"`,
+    `"directory"` or `"intern"`).
+    """
+
+    dirs_visited: int
+    files_probed: int
+    files_read: int
+    read_time: float
+    parses: Dict[str, int]
+    parse_time: Dict[str, float]
+    transforms: int
+    transform_time: float
+    cache_hits: Dict[str, int]
+    cache_misses: Dict[str, int]
+
+
+class Instrumentation:
+    """
+    @internal
+
+    Aggregates the events of an explorer, and passes them on to `sink`.
+    """
+
+    def __init__(self, sink: Optional[EventSink] = None) -> None:
+        self._sink = sink
+        self._lock = threading.Lock()
+        self._counts: DefaultDict[str, int] = defaultdict(int)
+        self._durations: DefaultDict[str, float] = defaultdict(float)
+        self._parses: DefaultDict[str, int] = defaultdict(int)
+        self._parse_time: DefaultDict[str, float] = defaultdict(float)
+        self._cache_hits: DefaultDict[str, int] = defaultdict(int)
+        self._cache_misses: DefaultDict[str, int] = defaultdict(int)
+
+    def emit(
+        self,
+        kind: str,
+        path: str,
+        duration: Optional[float] = None,
+        loader: Optional[str] = None,
+        cache: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._counts[kind] += 1
+            if duration is not None:
+                self._durations[kind] += duration
+            if kind == PARSE and loader is not None:
+                self._parses[loader] += 1
+                self._parse_time[loader] += duration or 0.0
+            elif kind == CACHE_HIT and cache is not None:
+                self._cache_hits[cache] += 1
+            elif kind == CACHE_MISS and cache is not None:
+                self._cache_misses[cache] += 1
+
+        if self._sink is not None:
+            self._sink(ExplorerEvent(kind, path, duration, loader, cache))
+
+    def stats(self) -> ExplorerStats:
+        with self._lock:
+            return ExplorerStats(
+                dirs_visited=self._counts[DIR_VISITED],
+                files_probed=self._counts[FILE_PROBED],
+                files_read=self._counts[FILE_READ],
+                read_time=self._durations[FILE_READ],
+                parses=dict(self._parses),
+                parse_time=dict(self._parse_time),
+                transforms=self._counts[TRANSFORM],
+                transform_time=self._durations[TRANSFORM],
+                cache_hits=dict(self._cache_hits),
+                cache_misses=dict(self._cache_misses),
+            )
+
+
+def get_loader_name(loader: Callable) -> str:
+    """@internal"""
+    return getattr(loader, "__name__", None) or type(loader).__name__
@@ -0,0 +1,222 @@
+import os
+import pickle
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+from pycosmiconfig.port.loaders import get_loader_parser_backend
+from pycosmiconfig.port.util import MISSING
+
+# Bump when the format of stored entries changes
+_FORMAT_VERSION = 1
+
+# The cache directory is pruned at most once per interval (in seconds), by
+# the process that stores an entry then. Entries that are used are marked
+# as such at most once per interval too.
+_PRUNE_INTERVAL = 24 * 60 * 60
+# File whose modification time is the time of the last pruning
+_PRUNE_STAMP = "last-prune"
+
+
+def get_default_cache_dir() -> Path:
+    """
+    Returns `$XDG_CACHE_HOME/pycosmiconfig`, or `~/.cache/pycosmiconfig`
+    if `XDG_CACHE_HOME` is not set.
+    """
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return Path(cache_home, "pycosmiconfig")
+
+
+class PersistentCache:
+    """
+    @internal
+
+    On-disk cache of parsed config files, shared between processes.
+
+    Each entry is a pickle file, named after the hash of the file path,
+    loader (including its code, and its parser backend and version), Python
+    version, and file content. So entries never go stale: when the file or
+    loader changes, it simply maps to a different entry. Entries that were
+    not used for `max_age` seconds, and the least recently used ones beyond
+    `max_entries`, are pruned.
+
+    Errors of reading or writing the cache are ignored, and the config is
+    parsed as if there was no cache.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path, None] = None,
+        max_entries: int = 10000,
+        max_age: float = 30 * 24 * 60 * 60,
+    ) -> None:
+        self.directory = Path(directory) if directory else get_default_cache_dir()
+        self.max_entries = max_entries
+        self.max_age = max_age
+
+    def make_key(
+        self, loader: Callable[..., Any], filepath: str, contents: str
+    ) -> Optional[str]:
+        """
+        Returns the cache key for parsing `contents` of `filepath` with `loader`,
+        or `None` if the loader's output should not be cached.
+        """
+        # Python config files are executed, their result may depend on
+        # more than the file content.
+        if Path(filepath).suffix == ".py":
+            return None
+        # Loader must be identifiable across processes
+        module = getattr(loader, "__module__", None)
+        qualname = getattr(loader, "__qualname__", None)
+        if not module or not qualname or "<" in qualname:
+            return None
+        # Output of the same loader differs between its versions, and between
+        # the parser backends (and their versions) of default loaders
+        code = _get_loader_code(loader, module)
+        if code is None:
+            return None
+        backend = get_loader_parser_backend(loader)
+
+        # Imported here, as only explorers with `persistent_cache` need it
+        import hashlib
+
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (
+            # Also the version of standard library parsers (`json`, `tomllib`)
+            f"{_FORMAT_VERSION}:{'.'.join(map(str, sys.version_info[:3]))}",
+            f"{module}.{qualname}",
+            f"{backend.name}:{backend.version or ''}" if backend is not None else "",
+            filepath,
+            contents,
+        ):
+            digest.update(part.encode("utf-8", "surrogatepass"))
+            digest.update(b"\0")
+        digest.update(code)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Any:
+        """Returns the entry of `key`, or `MISSING` if there is none."""
+        try:
+            with open(self._entry_path(key), "rb") as f:
+                value = pickle.load(f)
+                mtime = os.fstat(f.fileno()).st_mtime
+        except Exception:
+            return MISSING
+        # Pruning keeps recently used entries, by their modification time
+        if time.time() - mtime > _PRUNE_INTERVAL:
+            try:
+                os.utime(self._entry_path(key))
+            except OSError:
+                pass
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        import tempfile
+
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temp file first, so that other processes never
+            # see a partially written entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, self._entry_path(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception:
+            return
+        self._maybe_prune()
+
+    def add(self, key: str, value: Any) -> None:
+        """Stores `value` unless there already is an entry for `key`."""
+        if not self._entry_path(key).exists():
+            self.set(key, value)
+
+    def clear(self) -> None:
+        try:
+            entries = list(self.directory.iterdir())
+        except OSError:
+            return
+        for entry in entries:
+            if entry.suffix in (".pickle", ".tmp"):
+                try:
+                    entry.unlink()
+                except OSError:
+                    pass
+
+    def prune(self) -> None:
+        """
+        Removes entries that were not used for `max_age` seconds, and the least
+        recently used entries beyond `max_entries`.
+        """
+        now = time.time()
+        entries: List[Tuple[float, str]] = []
+        try:
+            with os.scandir(self.directory) as scanned:
+                for entry in scanned:
+                    name = entry.name
+                    if not name.endswith((".pickle", ".tmp")):
+                        continue
+                    try:
+                        mtime = entry.stat().st_mtime
+                    except OSError:
+                        continue
+                    if name.endswith(".pickle"):
+                        entries.append((mtime, entry.path))
+                    elif now - mtime > _PRUNE_INTERVAL:
+                        # Left behind by a process that was killed while writing
+                        _unlink(entry.path)
+        except OSError:
+            return
+
+        entries.sort(reverse=True)
+        for index, (mtime, path) in enumerate(entries):
+            if index >= self.max_entries or now - mtime > self.max_age:
+                _unlink(path)
+
+    def _maybe_prune(self) -> None:
+        stamp = self.directory / _PRUNE_STAMP
+        try:
+            if time.time() - stamp.stat().st_mtime < _PRUNE_INTERVAL:
+                return
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return
+        try:
+            stamp.touch()
+        except OSError:
+            return
+        self.prune()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.pickle"
+
+
+def _get_loader_code(loader: Callable[..., Any], module: str) -> Optional[bytes]:
+    # Code object of function loaders, including its constants, names and
+    # nested functions, otherwise the version of the package that defines
+    # the loader
+    code = getattr(loader, "__code__", None)
+    if code is not None:
+        import marshal
+
+        return marshal.dumps(code)
+    package = sys.modules.get(module.partition(".")[0], None)
+    version = getattr(package, "__version__", None)
+    if not isinstance(version, str):
+        return None
+    return version.encode("utf-8")
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
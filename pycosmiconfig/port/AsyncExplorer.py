@@ -0,0 +1,243 @@
+import asyncio
+import inspect
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TypeVar, Union
+
+from pycosmiconfig.port.types import AsyncCache, CosmiconfigResult, Config
+from pycosmiconfig.port.ExplorerBase import ExplorerBase, SearchPlace
+from pycosmiconfig.port.util import (
+    Dependencies,
+    add_dependency,
+    emplace_async,
+    inherit_dependencies,
+)
+
+T = TypeVar("T")
+
+
+async def _maybe_await(value: Any) -> Any:
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+async def _run_in_executor(fn: Callable[..., T], *args: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, fn, *args)
+
+
+def _read_file(filepath: Path, dependencies: Optional[Dependencies]) -> str:
+    # Fingerprint is taken before reading, so that changes made while
+    # reading invalidate the cache entry on next access.
+    add_dependency(dependencies, filepath)
+    with open(str(filepath), "r") as f:
+        return f.read()
+
+
+class AsyncExplorer(ExplorerBase):
+    """
+    @internal
+
+    PORT COMMENT: Equivalent of JS `Explorer`. Loaders and transforms may be
+                  sync or async. Filesystem access and sync loaders are run
+                  in the event loop's default executor. Caches hold futures
+                  (see `AsyncCache`), so concurrent calls share one computation.
+    """
+
+    async def load(self, filepath: str) -> Optional[CosmiconfigResult]:
+        load_cache: Optional[AsyncCache] = self._load_cache
+        resolved = self._resolve_cached(load_cache, filepath)
+
+        async def load(
+            dependencies: Optional[Dependencies] = None,
+        ) -> Optional[CosmiconfigResult]:
+            result = await self._read_configuration(resolved, dependencies)
+            return await self._transform(result)
+
+        if load_cache is not None:
+            return await emplace_async(
+                load_cache, str(resolved), load, self._load_dependencies
+            )
+        return await load()
+
+    async def search(self, from_dir_str: str = "") -> Optional[CosmiconfigResult]:
+        meta_config = await self._search_meta_config()
+        if meta_config is not None:
+            return meta_config
+
+        stop_dir = self._get_stop_dir()
+        search_cache: Optional[AsyncCache] = self._search_cache
+        from_dir = self._resolve_cached(search_cache, from_dir_str)
+        return await self._search_from(from_dir, stop_dir, search_cache)
+
+    async def search_many(
+        self, from_dir_strs: Iterable[str]
+    ) -> Dict[str, Optional[CosmiconfigResult]]:
+        """
+        Searches concurrently from each of the given directories, as if
+        `search()` was called for each of them. Returns a dict that maps each
+        given directory to its search result.
+        """
+        from_dir_strs = list(dict.fromkeys(from_dir_strs))
+
+        meta_config = await self._search_meta_config()
+        if meta_config is not None:
+            return {from_dir_str: meta_config for from_dir_str in from_dir_strs}
+
+        stop_dir = self._get_stop_dir()
+        search_cache: AsyncCache = {}
+        if self._search_cache is not None:
+            search_cache = self._search_cache
+
+        results: List[Optional[CosmiconfigResult]] = await asyncio.gather(
+            *(
+                self._search_from(self._resolve(from_dir_str), stop_dir, search_cache)
+                for from_dir_str in from_dir_strs
+            )
+        )
+        return dict(zip(from_dir_strs, results))
+
+    def _resolve_cached(self, cache: Optional[AsyncCache], path: str) -> Path:
+        # Caches are keyed by resolved paths, so a path that is cached already
+        # is one, and resolving it can be skipped (the entry is still validated)
+        if cache is not None and os.path.isabs(path) and path in cache:
+            return Path(path)
+        return self._resolve(path)
+
+    async def _search_meta_config(self) -> Optional[CosmiconfigResult]:
+        meta_filepath = self._meta_config_path
+        if meta_filepath is None:
+            return None
+
+        # PORT COMMENT: Meta config is read outside of the load cache, as the
+        #               cached result would otherwise be returned also
+        #               from `load()` of the same file.
+
+        async def load(
+            dependencies: Optional[Dependencies] = None,
+        ) -> Optional[CosmiconfigResult]:
+            result = await self._read_configuration(
+                meta_filepath, dependencies, loading_meta_config=True
+            )
+            return await self._transform(result)
+
+        if self._meta_config_cache is not None:
+            meta_config_cache: AsyncCache = self._meta_config_cache
+            config = await emplace_async(
+                meta_config_cache,
+                str(meta_filepath),
+                load,
+                self._meta_config_dependencies,
+            )
+        else:
+            config = await load()
+        if config and not config.is_empty:
+            return config
+        return None
+
+    async def _search_from(
+        self,
+        from_dir: Path,
+        stop_dir: Path,
+        search_cache: Optional[AsyncCache],
+    ) -> Optional[CosmiconfigResult]:
+        async def _search(
+            dependencies: Optional[Dependencies] = None,
+        ) -> Optional[CosmiconfigResult]:
+            nonlocal from_dir
+            result = await self._search_directory(from_dir, dependencies)
+            if result is not None:
+                return await self._transform(result)
+
+            parent_dir = from_dir.parent
+            if from_dir != stop_dir and from_dir != parent_dir:
+                from_dir = parent_dir
+                if search_cache is not None:
+                    return await self._emplace_search(
+                        search_cache, str(from_dir), _search, dependencies
+                    )
+                return await _search()
+            return await self._transform(None)
+
+        if search_cache is not None:
+            return await self._emplace_search(search_cache, str(from_dir), _search)
+        return await _search()
+
+    async def _emplace_search(
+        self,
+        search_cache: AsyncCache,
+        key: str,
+        search: Callable[..., Any],
+        dependencies: Optional[Dependencies] = None,
+    ) -> Optional[CosmiconfigResult]:
+        # Validation applies only to the explorer's own search cache
+        search_dependencies = None
+        if search_cache is self._search_cache:
+            search_dependencies = self._search_dependencies
+
+        result = await emplace_async(search_cache, key, search, search_dependencies)
+        # Result of a parent directory is also the result of its children,
+        # so children depend on everything the parent depends on
+        if search_dependencies is not None:
+            inherit_dependencies(dependencies, search_dependencies.get(key, None))
+        return result
+
+    async def _search_directory(
+        self, directory: Path, dependencies: Optional[Dependencies] = None
+    ) -> Optional[CosmiconfigResult]:
+        places: List[SearchPlace] = await _run_in_executor(
+            lambda: list(self._list_search_places(directory, dependencies))
+        )
+        for place in places:
+            try:
+                result = await self._read_configuration(
+                    directory / place.path, dependencies, place=place
+                )
+            except FileNotFoundError:
+                continue
+            except IsADirectoryError:
+                continue
+            except NotADirectoryError:
+                continue
+            if not (result.is_empty and self._config.ignore_empty_search_places):
+                return result
+        return None
+
+    async def _read_configuration(
+        self,
+        filepath: Union[str, Path],
+        dependencies: Optional[Dependencies] = None,
+        loading_meta_config: bool = False,
+        place: Optional[SearchPlace] = None,
+    ) -> CosmiconfigResult:
+        filepath = Path(filepath)
+        contents = await _run_in_executor(_read_file, filepath, dependencies)
+        config = await self._load_configuration(filepath, contents, place)
+        return self._to_cosmiconfig_result(str(filepath), config, loading_meta_config)
+
+    async def _load_configuration(
+        self, filepath: Path, contents: str, place: Optional[SearchPlace] = None
+    ) -> Optional[Config]:
+        steps = self._load_configuration_steps(filepath, contents, place)
+        try:
+            step = next(steps)
+            while True:
+                try:
+                    if step.is_parse and inspect.iscoroutinefunction(step.fn):
+                        value = await step.fn(*step.args)
+                    else:
+                        value = await _maybe_await(
+                            await _run_in_executor(step.fn, *step.args)
+                        )
+                except Exception as error:
+                    step = steps.throw(error)
+                else:
+                    step = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+    async def _transform(
+        self, result: Optional[CosmiconfigResult]
+    ) -> Optional[CosmiconfigResult]:
+        return self._freeze_result(await _maybe_await(self._config.transform(result)))
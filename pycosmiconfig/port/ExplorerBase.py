@@ -1,31 +1,236 @@
-from pathlib import Path
-from typing import Optional
+import copy
+import os
+import threading
+import time
+from pathlib import Path, PurePath
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
-from pycosmiconfig.port.types import InternalOptions, Cache, Config, CosmiconfigResult
-from pycosmiconfig.port.util import get_property_by_path
+from pycosmiconfig.caches import CacheStats, LRUCache, get_cache_factory
+from pycosmiconfig.instrumentation import (
+    CACHE_HIT,
+    CACHE_MISS,
+    PARSE,
+    ExplorerStats,
+    Instrumentation,
+    get_loader_name,
+)
+from pycosmiconfig.port.loaders import load_toml
+from pycosmiconfig.port.types import (
+    InternalOptions,
+    Cache,
+    Config,
+    ConfigChange,
+    CosmiconfigResult,
+    Loader,
+    LoaderResult,
+)
+from pycosmiconfig.port.util import (
+    MISSING,
+    Dependencies,
+    DirListings,
+    PlaceLookups,
+    SingleFlight,
+    are_dependencies_fresh,
+    emplace,
+    emplace_validated,
+    get_place_lookups,
+    get_property_by_path,
+    get_validated,
+    is_place_listed,
+    may_define_property,
+)
+
+# Only imported when an explorer uses them, to keep importing pycosmiconfig
+# cheap
+if TYPE_CHECKING:
+    from pycosmiconfig.persistent_cache import PersistentCache
+    from pycosmiconfig.watchers import Watcher
+
+# Parsed `pyproject.toml` documents keyed by path and content, shared by all
+# explorers, as many tools in one process read the same `pyproject.toml`,
+# each for its own `tool.*` table.
+pyproject_documents: LRUCache[Tuple[str, str], Config] = LRUCache(max_entries=64)
+"""@internal"""
+
+
+# PORT COMMENT: JS version reads `package.json`
+pyproject_file_names = frozenset(["pyproject.toml", "pyproject.tml"])
+"""@internal"""
+
+
+class SearchPlace(NamedTuple):
+    """
+    @internal
+
+    Search place with everything a search needs to probe it, worked out once
+    per explorer from the options.
+    """
+
+    place: str
+    # Joined onto searched directories
+    path: PurePath
+    # `None` if the place can't be found in directory listings
+    lookups: Optional[PlaceLookups]
+    loader: Loader
+    is_pyproject: bool
+
+
+# Memoized merge of `search_merged()`: the merged result of the parent
+# directory and the result of the directory itself it was merged from, and
+# the merged result
+MergeEntry = Tuple[
+    Optional[CosmiconfigResult], CosmiconfigResult, Optional[CosmiconfigResult]
+]
+"""@internal"""
+
+
+class LoadStep(NamedTuple):
+    """
+    @internal
+
+    Call `fn(*args)` that loading a config needs: the parse of a file by its
+    loader (`is_parse`), or an access of the persistent cache. Sync and async
+    explorers run these steps differently (e.g. the latter in an executor),
+    but decide on them in the same `ExplorerBase._load_configuration_steps()`.
+    """
+
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...]
+    is_parse: bool = False
+
+
+LoadSteps = Generator[LoadStep, Any, Optional[Config]]
+"""@internal"""
+
+
+# Cache entry of a watched explorer: id of the cache, and the key
+WatchedEntry = Tuple[int, str]
+"""@internal"""
 
 
 class ExplorerBase:
     """@internal"""
 
     def __init__(self, options: InternalOptions) -> None:
-        self._loading_meta_config: bool = False
         self._config: InternalOptions = options
         self._load_cache: Optional[Cache] = None
         self._search_cache: Optional[Cache] = None
+        # PORT COMMENT: Meta config file is cached separately from `load()`,
+        #               see `_search_meta_config()`.
+        self._meta_config_cache: Optional[Cache] = None
+        # Config of each directory on its own, and the configs merged from a
+        # directory up, for `search_all()` and `search_merged()`
+        self._directory_cache: Optional[Cache] = None
+        self._merge_cache: Optional[Cache] = None
+        # Loader results keyed by loader and content hash, shared by files
+        # with the same content. Only used if `intern_configs` is set.
+        self._interned_configs: Optional[Cache] = None
+        # Paths (and their stat fingerprints) each cache entry was computed
+        # from. Only used if `validate_cache` is set.
+        self._load_dependencies: Optional[Cache] = None
+        self._search_dependencies: Optional[Cache] = None
+        self._meta_config_dependencies: Optional[Cache] = None
+        self._directory_dependencies: Optional[Cache] = None
+
+        # Dependencies are kept in caches of the same policy, so that they
+        # are evicted too instead of outliving their entries.
+        create_cache = get_cache_factory(options.cache)
+        if create_cache is not None:
+            self._load_cache = create_cache()
+            self._search_cache = create_cache()
+            self._meta_config_cache = create_cache()
+            self._directory_cache = create_cache()
+            self._merge_cache = create_cache()
+            if options.intern_configs:
+                self._interned_configs = create_cache()
+
+            if options.validate_cache or options.watch:
+                self._load_dependencies = create_cache()
+                self._search_dependencies = create_cache()
+                self._meta_config_dependencies = create_cache()
+                self._directory_dependencies = create_cache()
 
-        if options.cache:
-            self._load_cache = {}
-            self._search_cache = {}
+        # Concurrent computations of the same cache entry wait for one another
+        # instead of each computing it. Only used if `thread_safe` is set.
+        self._single_flight: Optional[SingleFlight] = None
+        if options.thread_safe:
+            self._single_flight = SingleFlight()
 
-        self._validate_config()
+        # Parsed configs shared across processes. Only used if
+        # `persistent_cache` is set.
+        self._persistent_cache: Optional["PersistentCache"] = None
+        if options.persistent_cache:
+            from pycosmiconfig import persistent_cache
 
-    def _validate_config(self) -> None:
+            self._persistent_cache = persistent_cache.PersistentCache(
+                options.persistent_cache_dir
+            )
+
+        # Cache entries are evicted when the paths they depend on change.
+        # Only used if `watch` is set (and caching is on).
+        self._watcher: Optional["Watcher"] = None
+        self._watch_lock = threading.Lock()
+        # Entries that depend on each path, and the dependencies each entry
+        # was registered with
+        self._watch_index: Dict[str, Set[WatchedEntry]] = {}
+        self._watched_entries: Dict[WatchedEntry, Dependencies] = {}
+        # Watched entries with paths that could not be watched (e.g. as the
+        # inotify watch limit was reached), which are validated instead
+        self._unwatched_entries: Set[WatchedEntry] = set()
+        # Casefolded names of directory entries that can change search results
+        # (as places are also matched case-insensitively, see
+        # `is_place_listed()`), or `None` if any name can (search places
+        # outside of the searched directory)
+        self._watched_names: Optional[Set[str]] = set()
+        for place in options.search_places:
+            parts = Path(place).parts
+            if Path(place).is_absolute() or ".." in parts:
+                self._watched_names = None
+                break
+            self._watched_names.update(part.casefold() for part in parts)
+        if options.watch and self._load_cache is not None:
+            from pycosmiconfig.watchers import create_watcher
+
+            kind = "auto" if options.watch is True else options.watch
+            self._watcher = create_watcher(kind, self._on_path_changed)
+
+        # Events of searches and loads, aggregated for `stats()`. Only used
+        # if `instrument` is set.
+        self._instrumentation: Optional[Instrumentation] = None
+        if options.instrument:
+            sink = None if options.instrument is True else options.instrument
+            self._instrumentation = Instrumentation(sink)
+
+        # Search places compiled by `_validate_config()`, in search order
+        self._search_plan: Tuple[SearchPlace, ...] = self._validate_config()
+
+        # Resolved once instead of on every search. A relative `stop_dir`
+        # depends on the working directory, and is resolved per search.
+        self._stop_dir: Optional[Path] = None
+        if os.path.isabs(options.stop_dir):
+            self._stop_dir = self._resolve(options.stop_dir)
+        self._meta_config_path: Optional[Path] = None
+        if options.meta_config_file_path:
+            self._meta_config_path = self._resolve(options.meta_config_file_path)
+
+    def _validate_config(self) -> Tuple[SearchPlace, ...]:
+        search_plan: List[SearchPlace] = []
         for place in self._config.search_places:
-            extension = Path(place).suffix
-            loader = self._config.loaders.get(extension or "noExt", None)
-            if loader is None:
-                loader = self._config.loaders.get("default", None)
+            path = PurePath(place)
+            extension = path.suffix
+            loader = self._get_loader(extension)
 
             if loader is None:
                 raise ValueError(
@@ -38,20 +243,485 @@ class ExplorerBase:
                     f"Loader for {desc} is not a function: Received {loader_type}."
                 )
 
+            search_plan.append(
+                SearchPlace(
+                    place=place,
+                    path=path,
+                    lookups=get_place_lookups(place),
+                    loader=loader,
+                    is_pyproject=path.name in pyproject_file_names,
+                )
+            )
+        return tuple(search_plan)
+
+    def _get_loader(self, extension: str) -> Optional[Loader]:
+        loader = self._config.loaders.get(extension or "noExt", None)
+        if loader is None:
+            loader = self._config.loaders.get("default", None)
+        return loader
+
     def clear_load_cache(self) -> None:
-        if self._load_cache:
+        self._forget_watched_entries([self._load_cache, self._meta_config_cache])
+        if self._load_cache is not None:
             self._load_cache.clear()
+        if self._load_dependencies is not None:
+            self._load_dependencies.clear()
+        if self._meta_config_cache is not None:
+            self._meta_config_cache.clear()
+        if self._meta_config_dependencies is not None:
+            self._meta_config_dependencies.clear()
+        if self._interned_configs is not None:
+            self._interned_configs.clear()
 
     def clear_search_cache(self) -> None:
-        if self._search_cache:
+        self._forget_watched_entries([self._search_cache, self._directory_cache])
+        if self._search_cache is not None:
             self._search_cache.clear()
+        if self._search_dependencies is not None:
+            self._search_dependencies.clear()
+        if self._directory_cache is not None:
+            self._directory_cache.clear()
+        if self._directory_dependencies is not None:
+            self._directory_dependencies.clear()
+        if self._merge_cache is not None:
+            self._merge_cache.clear()
 
     def clear_caches(self) -> None:
         self.clear_load_cache()
         self.clear_search_cache()
 
+    def cache_stats(self) -> Dict[str, CacheStats]:
+        """
+        Returns hit, miss and eviction counters of the load and search caches.
+        Caches that don't keep counters (custom caches) are left out.
+        """
+        stats: Dict[str, CacheStats] = {}
+        for name, cache in (("load", self._load_cache), ("search", self._search_cache)):
+            get_stats = getattr(cache, "stats", None)
+            if callable(get_stats):
+                stats[name] = get_stats()
+        return stats
+
+    def stats(self) -> Optional[ExplorerStats]:
+        """
+        Returns the totals of the events of this explorer (directories visited,
+        files read, parse and transform times, cache hits and misses), or
+        `None` if `instrument` is not set.
+        """
+        if self._instrumentation is None:
+            return None
+        return self._instrumentation.stats()
+
+    def close(self) -> None:
+        """Stops watching the filesystem. Only needed if `watch` is set."""
+        if self._watcher is not None:
+            self._watcher.close()
+
+    def _resolve(self, path: str) -> Path:
+        # Paths of search results are absolute, and (unless symlinks are
+        # preserved) real paths. Parents of such paths are too, so searches
+        # resolve where they start, and walk up lexically from there.
+        if self._config.preserve_symlinks:
+            return Path(os.path.abspath(path))
+        return Path(path).resolve()
+
+    def _get_stop_dir(self) -> Path:
+        if self._stop_dir is not None:
+            return self._stop_dir
+        return self._resolve(self._config.stop_dir)
+
+    def _load_configuration_steps(
+        self, filepath: Path, contents: str, place: Optional[SearchPlace] = None
+    ) -> LoadSteps:
+        """
+        Loads the config of `filepath` with content `contents`, yielding the
+        parses and the persistent cache accesses as `LoadStep`s, which the
+        explorer runs (and sends their results back) in its own way. Returns
+        the config.
+        """
+        if not contents.strip():
+            return None
+
+        # Files of search places were compiled into the search plan, other
+        # files (`load()`, meta config) are looked up here
+        loader: Optional[Loader]
+        if place is not None:
+            is_pyproject, loader = place.is_pyproject, place.loader
+        else:
+            is_pyproject = filepath.name in pyproject_file_names
+            loader = self._get_loader(filepath.suffix)
+
+        if is_pyproject:
+            return (
+                yield from self._load_pyproject_property_steps(str(filepath), contents)
+            )
+
+        try:
+            if loader:
+                return (
+                    yield from self._run_loader_steps(loader, str(filepath), contents)
+                )
+        except Exception as error:
+            error.filepath = str(filepath)  # type: ignore[attr-defined]
+            raise error
+        raise ValueError(
+            f"No loader specified for {get_extension_description(filepath.suffix)}"
+        )
+
+    def _run_loader_steps(
+        self, loader: Callable[..., Any], filepath: str, contents: str
+    ) -> LoadSteps:
+        # Python config files are executed, their result may depend on
+        # more than the file content
+        interned_configs = self._interned_configs
+        if interned_configs is None or Path(filepath).suffix == ".py":
+            return self._freeze(
+                (
+                    yield from self._run_loader_persisted_steps(
+                        loader, filepath, contents
+                    )
+                )
+            )
+
+        key = get_intern_key(loader, contents)
+        result = interned_configs.get(key, MISSING)
+        self._emit_cache_lookup(interned_configs, filepath, hit=result is not MISSING)
+        if result is MISSING:
+            result = self._freeze(
+                (
+                    yield from self._run_loader_persisted_steps(
+                        loader, filepath, contents
+                    )
+                )
+            )
+            interned_configs[key] = result
+        return result
+
+    def _freeze(self, config: Config) -> Config:
+        if self._config.freeze_configs:
+            from pycosmiconfig.frozen import freeze
+
+            return freeze(config)
+        return config
+
+    def _freeze_result(
+        self, result: Optional[CosmiconfigResult]
+    ) -> Optional[CosmiconfigResult]:
+        # Configs of loaders are frozen already, only configs that a transform
+        # created are frozen here
+        if result is not None and self._config.freeze_configs:
+            from pycosmiconfig.frozen import freeze
+
+            result.config = freeze(result.config)
+        return result
+
+    def _run_loader_persisted_steps(
+        self, loader: Callable[..., Any], filepath: str, contents: str
+    ) -> LoadSteps:
+        parse = LoadStep(loader, (filepath, contents), is_parse=True)
+        persistent_cache = self._persistent_cache
+        key = None
+        if persistent_cache is not None:
+            key = persistent_cache.make_key(loader, filepath, contents)
+        if persistent_cache is None or key is None:
+            return (yield parse)
+
+        result = yield LoadStep(persistent_cache.get, (key,))
+        if result is MISSING:
+            result = yield parse
+            yield LoadStep(persistent_cache.set, (key, result))
+        return result
+
+    def _parse(self, loader: Loader, filepath: str, contents: str) -> LoaderResult:
+        if self._instrumentation is None:
+            return loader(filepath, contents)
+        start = time.perf_counter()
+        result = loader(filepath, contents)
+        self._instrumentation.emit(
+            PARSE,
+            filepath,
+            duration=time.perf_counter() - start,
+            loader=get_loader_name(loader),
+        )
+        return result
+
+    def _load_pyproject_property_steps(self, filepath: str, contents: str) -> LoadSteps:
+        # Most `pyproject.toml` files have no table for this tool, and need
+        # not be parsed at all then
+        if not may_define_property(contents, self._config.package_prop):
+            return None
+        key = (filepath, contents)
+        document = pyproject_documents.get(key, MISSING)
+        if document is MISSING:
+            # Documents are shared with other explorers (by path and content),
+            # so they are neither frozen nor interned, only the property is
+            # frozen below
+            document = yield from self._run_loader_persisted_steps(
+                load_toml, filepath, contents
+            )
+            pyproject_documents[key] = document
+        elif self._persistent_cache is not None:
+            # Document may have been parsed by an explorer without persistent
+            # cache (e.g. the meta config explorer)
+            yield LoadStep(
+                self._persist_loader_result, (load_toml, filepath, contents, document)
+            )
+        return self._get_pyproject_property(document)
+
+    def _get_pyproject_property(self, document: Config) -> Config:
+        # Copied (frozen configs are copies too), so that changes of one
+        # explorer's result don't leak into the shared document
+        config = get_property_by_path(document, self._config.package_prop)
+        if self._config.freeze_configs:
+            return self._freeze(config)
+        return copy.deepcopy(config)
+
+    def _persist_loader_result(
+        self, loader: Loader, filepath: str, contents: str, result: LoaderResult
+    ) -> None:
+        if self._persistent_cache is None:
+            return
+        key = self._persistent_cache.make_key(loader, filepath, contents)
+        if key is not None:
+            self._persistent_cache.add(key, result)
+
+    def _emplace_cached(
+        self,
+        cache: Optional[Cache],
+        dependencies: Optional[Cache],
+        key: str,
+        fn: Callable[..., Optional[CosmiconfigResult]],
+    ) -> Optional[CosmiconfigResult]:
+        if cache is None:
+            return fn()
+        if self._instrumentation is None:
+            return self._emplace_in(cache, dependencies, key, fn)
+
+        computed = False
+
+        def compute(*args: Dependencies) -> Optional[CosmiconfigResult]:
+            nonlocal computed
+            computed = True
+            return fn(*args)
+
+        result = self._emplace_in(cache, dependencies, key, compute)
+        self._emit_cache_lookup(cache, key, hit=not computed)
+        return result
+
+    def _emplace_in(
+        self,
+        cache: Cache,
+        dependencies: Optional[Cache],
+        key: str,
+        fn: Callable[..., Optional[CosmiconfigResult]],
+    ) -> Optional[CosmiconfigResult]:
+        if dependencies is not None:
+            return self._emplace_validated(cache, dependencies, key, fn)
+        return self._emplace(cache, key, fn)
+
+    def _get_cached(
+        self,
+        cache: Cache,
+        dependencies: Optional[Cache],
+        key: str,
+    ) -> Any:
+        """Returns the (still valid) cached value of `key`, or `MISSING`."""
+        if dependencies is None:
+            return cache.get(key, MISSING)
+        validate = self._should_validate(cache, key)
+        return get_validated(cache, dependencies, key, MISSING, validate)
+
+    def _should_validate(self, cache: Cache, key: str) -> bool:
+        # Watched entries are evicted on change instead of being validated,
+        # unless some of their paths could not be watched
+        return self._watcher is None or (id(cache), key) in self._unwatched_entries
+
+    def _is_stale(self, cache: Cache, dependencies: Optional[Cache], key: str) -> bool:
+        if dependencies is None or not self._should_validate(cache, key):
+            return False
+        return not are_dependencies_fresh(dependencies.get(key, None))
+
+    def _get_cached_by_path(
+        self,
+        cache: Optional[Cache],
+        dependencies: Optional[Cache],
+        path: str,
+    ) -> Any:
+        """
+        Looks `path` up as given by the caller, to skip resolving it on hits.
+        Caches are keyed by resolved paths, so this only hits if `path` is
+        one already.
+        """
+        # Checked with `in` (and stale entries before they are looked up)
+        # first, so that misses are only counted once, by the lookup of the
+        # resolved path
+        if cache is None or not os.path.isabs(path) or path not in cache:
+            return MISSING
+        if self._is_stale(cache, dependencies, path):
+            return MISSING
+        cached = self._get_cached(cache, dependencies, path)
+        if cached is not MISSING:
+            self._emit_cache_lookup(cache, path, hit=True)
+        return cached
+
+    def _emit_cache_lookup(self, cache: Cache, key: str, hit: bool) -> None:
+        if self._instrumentation is not None:
+            self._instrumentation.emit(
+                CACHE_HIT if hit else CACHE_MISS,
+                key,
+                cache=self._get_cache_name(cache),
+            )
+
+    def _get_cache_name(self, cache: Cache) -> str:
+        if cache is self._load_cache:
+            return "load"
+        if cache is self._meta_config_cache:
+            return "meta_config"
+        if cache is self._directory_cache:
+            return "directory"
+        if cache is self._interned_configs:
+            return "intern"
+        # Also the uncached `search_many()` scratch cache
+        return "search"
+
+    def _emplace(
+        self,
+        cache: Cache,
+        key: str,
+        fn: Callable[[], Optional[CosmiconfigResult]],
+    ) -> Optional[CosmiconfigResult]:
+        if self._single_flight is None or key in cache:
+            return emplace(cache, key, fn)
+        return self._single_flight.run(
+            (id(cache), key), lambda: emplace(cache, key, fn)
+        )
+
+    def _emplace_validated(
+        self,
+        cache: Cache,
+        dependencies: Cache,
+        key: str,
+        fn: Callable[[Dependencies], Optional[CosmiconfigResult]],
+    ) -> Optional[CosmiconfigResult]:
+        validate = self._should_validate(cache, key)
+        if self._single_flight is None:
+            result = emplace_validated(cache, dependencies, key, fn, validate)
+        else:
+            result = self._single_flight.run(
+                (id(cache), key),
+                lambda: emplace_validated(cache, dependencies, key, fn, validate),
+            )
+        if self._watcher is not None:
+            self._watch_entry(cache, dependencies, key)
+        return result
+
+    def _watch_entry(self, cache: Cache, dependencies: Cache, key: str) -> None:
+        watcher = self._watcher
+        if watcher is None:
+            return
+        entry = (id(cache), key)
+        key_dependencies = dependencies.get(key, None)
+        with self._watch_lock:
+            if (
+                key_dependencies is None
+                or self._watched_entries.get(entry, None) is key_dependencies
+            ):
+                return
+            self._unindex_entry(entry)
+            self._watched_entries[entry] = key_dependencies
+            for path, _ in key_dependencies:
+                self._watch_index.setdefault(path, set()).add(entry)
+
+        watched = True
+        for path, _ in key_dependencies:
+            if path and not watcher.watch(path):
+                watched = False
+        if not watched:
+            with self._watch_lock:
+                if self._watched_entries.get(entry, None) is key_dependencies:
+                    self._unwatched_entries.add(entry)
+        # Paths may have changed after they were fingerprinted, but before
+        # they were watched
+        if not are_dependencies_fresh(key_dependencies):
+            self._evict_entries({entry})
+
+    def _unindex_entry(self, entry: WatchedEntry) -> None:
+        # Must be called with the watch lock held
+        self._unwatched_entries.discard(entry)
+        for path, _ in self._watched_entries.pop(entry, None) or []:
+            entries = self._watch_index.get(path, None)
+            if entries is not None:
+                entries.discard(entry)
+                if not entries:
+                    del self._watch_index[path]
+
+    def _forget_watched_entries(self, caches: List[Optional[Cache]]) -> None:
+        cache_ids = {id(cache) for cache in caches if cache is not None}
+        with self._watch_lock:
+            for entry in list(self._watched_entries):
+                if entry[0] in cache_ids:
+                    self._unindex_entry(entry)
+
+    def _on_path_changed(self, directory: str, name: Optional[str]) -> None:
+        # Changed file or subdirectory, or a changed directory listing
+        # if the name matters to the search
+        paths = [directory]
+        if name is not None:
+            paths = [os.path.join(directory, name)]
+            watched_names = self._watched_names
+            if watched_names is None or name.casefold() in watched_names:
+                paths.append(directory)
+
+        with self._watch_lock:
+            entries: Set[WatchedEntry] = set()
+            for path in paths:
+                entries.update(self._watch_index.get(path, ()))
+        if not entries:
+            return
+
+        loads, searches = self._evict_entries(entries)
+        if self._config.on_change is not None and (loads or searches):
+            self._config.on_change(
+                ConfigChange(path=paths[0], loads=loads, searches=searches)
+            )
+
+    def _evict_entries(self, entries: Set[WatchedEntry]) -> Tuple[List[str], List[str]]:
+        evicted: Dict[int, List[str]] = {}
+        caches = [
+            self._load_cache,
+            self._search_cache,
+            self._meta_config_cache,
+            self._directory_cache,
+        ]
+        caches_by_id = {id(cache): cache for cache in caches if cache is not None}
+        with self._watch_lock:
+            for entry in entries:
+                cache_id, key = entry
+                self._unindex_entry(entry)
+                cache = caches_by_id.get(cache_id, None)
+                if cache is not None and key in cache:
+                    try:
+                        del cache[key]
+                    except KeyError:
+                        continue
+                    evicted.setdefault(cache_id, []).append(key)
+        # Configs of directories on their own are search results too
+        searches = set(evicted.get(id(self._search_cache), []))
+        searches.update(evicted.get(id(self._directory_cache), []))
+        return sorted(evicted.get(id(self._load_cache), [])), sorted(searches)
+
+    def _list_search_places(
+        self, directory: Path, dependencies: Optional[Dependencies] = None
+    ) -> Iterator[SearchPlace]:
+        # List the directory (and subdirectories like `.config/`) once and
+        # only yield search places that are actually present in the listing.
+        listings: DirListings = {}
+        for place in self._search_plan:
+            if is_place_listed(directory, place.lookups, listings, dependencies):
+                yield place
+
     def _to_cosmiconfig_result(
-        self, filepath: str, config: Config
+        self, filepath: str, config: Config, loading_meta_config: bool = False
     ) -> CosmiconfigResult:
         # PORT COMMENT: We don't distinguish between null and undefined
         if config is None:
@@ -59,10 +729,10 @@ class ExplorerBase:
 
         if (
             self._config.apply_package_property_path_to_configuration
-            or self._loading_meta_config
+            or loading_meta_config
         ):
             prop_name = self._config.config_prop
-            if Path(filepath).name in ["pyproject.toml", "pyproject.tml"]:
+            if Path(filepath).name in pyproject_file_names:
                 prop_name = self._config.package_prop
             config = get_property_by_path(config, prop_name)
         if config is None:
@@ -71,6 +741,21 @@ class ExplorerBase:
         return CosmiconfigResult(config=config, filepath=filepath)
 
 
+def get_intern_key(loader: Callable[..., Any], contents: str) -> str:
+    """
+    @internal
+
+    Returns the key of the result of parsing `contents` with `loader` in
+    the `intern_configs` cache.
+    """
+    # Imported here, as only explorers with `intern_configs` need it
+    import hashlib
+
+    digest = hashlib.blake2b(contents.encode("utf-8", "surrogatepass"), digest_size=20)
+    # Loaders are kept alive by the options, so their ids are stable
+    return f"{id(loader):x}:{digest.hexdigest()}"
+
+
 def get_extension_description(extension: Optional[str]) -> str:
     """@internal"""
     return f'extension "{extension}"' if extension else "files without extensions"
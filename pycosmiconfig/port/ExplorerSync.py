@@ -1,92 +1,537 @@
+import time
 from pathlib import Path
-from typing import Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+    cast,
+)
 
-from pycosmiconfig.port.loaders import load_toml
-from pycosmiconfig.port.types import CosmiconfigResult, Config
-from pycosmiconfig.port.ExplorerBase import ExplorerBase, get_extension_description
-from pycosmiconfig.port.util import emplace, get_property_by_path
+from pycosmiconfig.instrumentation import DIR_VISITED, FILE_PROBED, FILE_READ, TRANSFORM
+from pycosmiconfig.port.types import Cache, CosmiconfigResult, Config, Transform
+from pycosmiconfig.port.ExplorerBase import (
+    ExplorerBase,
+    SearchPlace,
+)
+from pycosmiconfig.port.util import (
+    MISSING,
+    Dependencies,
+    add_dependency,
+    inherit_dependencies,
+    merge_configs,
+)
+
+# Only needed by `search_many()` with `max_workers`, imported there
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+PrefetchedEntry = Tuple["Future[Any]", Optional[Dependencies]]
+"""@internal"""
+
+
+class Prefetched:
+    """
+    @internal
+
+    Directory listings and file reads done ahead of a search in a thread pool.
+    Each future comes with the dependencies it recorded for `validate_cache`.
+    Reads are results, or only the file contents if `contents_only` is set.
+    """
+
+    def __init__(self, contents_only: bool = False) -> None:
+        self.listings: Dict[Path, PrefetchedEntry] = {}
+        self.reads: Dict[Path, PrefetchedEntry] = {}
+        self.contents_only = contents_only
+
+
+def _prefetched_result(
+    entry: PrefetchedEntry,
+    dependencies: Optional[Dependencies],
+) -> Any:
+    future, future_dependencies = entry
+    try:
+        return future.result()
+    finally:
+        if dependencies is not None and future_dependencies is not None:
+            dependencies.extend(future_dependencies)
+
+
+def _walk_up(from_dir: Path, stop_dir: Path) -> Iterator[Path]:
+    directory = from_dir
+    while True:
+        yield directory
+        if directory == stop_dir or directory == directory.parent:
+            return
+        directory = directory.parent
 
 
 class ExplorerSync(ExplorerBase):
     """@internal"""
 
     def load(self, filepath: str) -> CosmiconfigResult:
-        filepath = Path(filepath).resolve()
+        cached = self._get_cached_by_path(
+            self._load_cache, self._load_dependencies, filepath
+        )
+        if cached is not MISSING:
+            return cached
+        filepath = self._resolve(filepath)
 
-        def load() -> CosmiconfigResult:
-            return self._config.transform(self._read_configuration(filepath))
+        def load(dependencies: Optional[Dependencies] = None) -> CosmiconfigResult:
+            return self._transform(self._read_configuration(filepath, dependencies))
 
-        if self._load_cache:
-            return emplace(self._load_cache, str(filepath), load)
-        return load()
+        return self._emplace_cached(
+            self._load_cache, self._load_dependencies, str(filepath), load
+        )
 
     def search(self, from_dir_str: str = "") -> Optional[CosmiconfigResult]:
-        if self._config.meta_config_file_path:
-            self._loading_meta_config = True
-            config = self.load(self._config.meta_config_file_path)
-            self._loading_meta_config = False
-            if config and not config.is_empty:
-                return config
-
-        stop_dir = Path(self._config.stop_dir).resolve()
-        from_dir = Path(from_dir_str).resolve()
-
-        def _search() -> Optional[CosmiconfigResult]:
-            nonlocal from_dir
-            if from_dir.is_dir():
-                for place in self._config.search_places:
-                    filepath = from_dir / place
-                    try:
-                        result = self._read_configuration(filepath)
-                        if result and not (
-                            result.is_empty and self._config.ignore_empty_search_places
-                        ):
-                            return self._config.transform(result)
-                    except FileNotFoundError:
-                        continue
-                    except IsADirectoryError:
-                        continue
-                    except NotADirectoryError:
-                        continue
-
-            parent_dir = from_dir.parent.resolve()
-            if from_dir != stop_dir and from_dir != parent_dir:
-                from_dir = parent_dir
-                if self._search_cache is not None:
-                    return emplace(self._search_cache, str(from_dir), _search)
-                return _search()
-            return self._config.transform(None)
+        meta_config = self._search_meta_config()
+        if meta_config is not None:
+            return meta_config
+
+        cached = self._get_cached_by_path(
+            self._search_cache, self._search_dependencies, from_dir_str
+        )
+        if cached is not MISSING:
+            return cached
+        from_dir = self._resolve(from_dir_str)
+        return self._search_from(from_dir, self._get_stop_dir(), self._search_cache)
+
+    def search_many(
+        self, from_dir_strs: Iterable[str], max_workers: Optional[int] = None
+    ) -> Dict[str, Optional[CosmiconfigResult]]:
+        """
+        Searches from each of the given directories, as if `search()` was called
+        for each of them. Returns a dict that maps each given directory to its
+        search result.
+
+        Each directory is searched only once, also when it is shared by multiple
+        searches as a common ancestor, or when the explorer has no search cache.
+
+        If `max_workers` is set, directories are listed and config files read
+        in a thread pool of that size first. Results (and raised errors) are
+        the same as without it.
+        """
+        from_dir_strs = list(from_dir_strs)
 
+        meta_config = self._search_meta_config()
+        if meta_config is not None:
+            return {from_dir_str: meta_config for from_dir_str in from_dir_strs}
+
+        stop_dir = self._get_stop_dir()
+        search_cache: Cache = {}
         if self._search_cache is not None:
-            return emplace(self._search_cache, str(from_dir), _search)
-        return _search()
+            search_cache = self._search_cache
 
-    def _read_configuration(self, filepath: Union[str, Path]) -> CosmiconfigResult:
-        filepath = Path(filepath)
-        with open(str(filepath), 'r') as f:
-            contents = f.read()
-        config = self._load_configuration(filepath, contents)
-        return self._to_cosmiconfig_result(str(filepath), config)
+        from_dirs: Dict[str, Path] = {}
+        for from_dir_str in from_dir_strs:
+            if from_dir_str not in from_dirs:
+                from_dirs[from_dir_str] = self._resolve(from_dir_str)
+
+        prefetched: Optional[Prefetched] = None
+        if max_workers is not None:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                prefetched = self._prefetch(
+                    executor, from_dirs.values(), stop_dir, search_cache
+                )
+                return {
+                    from_dir_str: self._search_from(
+                        from_dir, stop_dir, search_cache, prefetched
+                    )
+                    for from_dir_str, from_dir in from_dirs.items()
+                }
+
+        return {
+            from_dir_str: self._search_from(from_dir, stop_dir, search_cache)
+            for from_dir_str, from_dir in from_dirs.items()
+        }
+
+    def search_all(self, from_dir_str: str = "") -> List[CosmiconfigResult]:
+        """
+        Returns the configs of the given directory and of every directory above
+        it, up to `stop_dir`, nearest first. The config of each directory is the
+        one `search()` would find in that directory alone.
+
+        The config of each directory is cached on its own, so searches from
+        directories that share ancestors read those only once.
+        """
+        meta_config = self._search_meta_config()
+        if meta_config is not None:
+            return [meta_config]
+
+        results: List[CosmiconfigResult] = []
+        from_dir = self._resolve(from_dir_str)
+        for directory in _walk_up(from_dir, self._get_stop_dir()):
+            result = self._search_own_directory(directory)
+            if result is not None:
+                results.append(result)
+        return results
+
+    def search_merged(self, from_dir_str: str = "") -> Optional[CosmiconfigResult]:
+        """
+        Deep-merges the configs `search_all()` returns, nearer configs
+        overriding farther ones. The result has the `filepath` of the nearest
+        config.
+
+        The merged result of each directory is built from that of its parent,
+        and is reused as long as neither changes. So sibling directories share
+        the merged results of their ancestors, and the values their own configs
+        don't override.
+        """
+        meta_config = self._search_meta_config()
+        if meta_config is not None:
+            return meta_config
+
+        from_dir = self._resolve(from_dir_str)
+        directories = list(_walk_up(from_dir, self._get_stop_dir()))
+        merged: Optional[CosmiconfigResult] = None
+        for directory in reversed(directories):
+            own = self._search_own_directory(directory)
+            if own is not None:
+                merged = self._merge_directory(str(directory), merged, own)
+        return merged
+
+    def _search_own_directory(self, directory: Path) -> Optional[CosmiconfigResult]:
+        def search(
+            dependencies: Optional[Dependencies] = None,
+        ) -> Optional[CosmiconfigResult]:
+            result = self._search_directory(directory, dependencies)
+            return self._transform(result) if result is not None else None
+
+        return self._emplace_cached(
+            self._directory_cache, self._directory_dependencies, str(directory), search
+        )
+
+    def _merge_directory(
+        self,
+        key: str,
+        parent: Optional[CosmiconfigResult],
+        own: CosmiconfigResult,
+    ) -> Optional[CosmiconfigResult]:
+        if own.config is None:
+            return parent if parent is not None else own
+        if parent is None or parent.config is None:
+            return own
 
-    def _load_configuration(self, filepath: Path, contents: str) -> Optional[Config]:
-        if not contents.strip():
+        # Cached results are replaced (not changed) when they are recomputed,
+        # so the merge is up to date as long as it was made from the same ones
+        merge_cache = self._merge_cache
+        if merge_cache is not None:
+            entry = merge_cache.get(key, None)
+            if entry is not None and entry[0] is parent and entry[1] is own:
+                return entry[2]
+
+        merged = CosmiconfigResult(
+            config=self._freeze(merge_configs(parent.config, own.config)),
+            filepath=own.filepath,
+        )
+        if merge_cache is not None:
+            merge_cache[key] = (parent, own, merged)
+        return merged
+
+    def _prefetch(
+        self,
+        executor: "ThreadPoolExecutor",
+        from_dirs: Iterable[Path],
+        stop_dir: Path,
+        search_cache: Cache,
+    ) -> Prefetched:
+        # Only work that the (serial) search would do anyway is prefetched.
+        # Writes to the explorer's caches are left to the search itself, on
+        # this thread. The interning cache is written while loading, so with
+        # `intern_configs` files are only read ahead, not loaded.
+        prefetched = Prefetched(contents_only=self._interned_configs is not None)
+        validate = self._search_dependencies is not None
+
+        def submit_listing(directory: Path) -> None:
+            dependencies: Optional[Dependencies] = [] if validate else None
+            future = executor.submit(
+                lambda: list(self._list_search_places(directory, dependencies))
+            )
+            prefetched.listings[directory] = (future, dependencies)
+
+        def submit_read(filepath: Path, place: SearchPlace) -> None:
+            dependencies: Optional[Dependencies] = [] if validate else None
+            future: "Future[Any]"
+            if prefetched.contents_only:
+                future = executor.submit(self._read_file, filepath, dependencies)
+            else:
+                future = executor.submit(
+                    self._read_configuration, filepath, dependencies, place=place
+                )
+            prefetched.reads[filepath] = (future, dependencies)
+
+        def parents(from_dir: Path) -> Iterator[Path]:
+            directory = from_dir
+            while str(directory) not in search_cache:
+                yield directory
+                if directory == stop_dir or directory == directory.parent:
+                    return
+                directory = directory.parent
+
+        for from_dir in from_dirs:
+            for directory in parents(from_dir):
+                if directory in prefetched.listings:
+                    break
+                submit_listing(directory)
+
+        # The first search place found in the nearest directory that has any
+        # is read by the search for sure, so it is safe to read it ahead.
+        for from_dir in from_dirs:
+            for directory in parents(from_dir):
+                future, _ = prefetched.listings[directory]
+                if future.exception() is not None:
+                    break
+                places = future.result()
+                if places:
+                    filepath = directory / places[0].path
+                    if filepath not in prefetched.reads:
+                        submit_read(filepath, places[0])
+                    break
+
+        return prefetched
+
+    def _search_meta_config(self) -> Optional[CosmiconfigResult]:
+        meta_filepath = self._meta_config_path
+        if meta_filepath is None:
             return None
 
-        # PORT COMMENT: JS version reads `package.json`
-        if filepath.name in ["pyproject.toml", "pyproject.tml"]:
-            pyproject_conf = load_toml(str(filepath), contents)
-            return get_property_by_path(pyproject_conf, self._config.package_prop)
+        # PORT COMMENT: Meta config is read outside of the load cache, as the
+        #               cached result would otherwise be returned also
+        #               from `load()` of the same file.
+
+        def load(
+            dependencies: Optional[Dependencies] = None,
+        ) -> Optional[CosmiconfigResult]:
+            return self._transform(
+                self._read_configuration(
+                    meta_filepath, dependencies, loading_meta_config=True
+                )
+            )
+
+        config = self._emplace_cached(
+            self._meta_config_cache,
+            self._meta_config_dependencies,
+            str(meta_filepath),
+            load,
+        )
+        if config and not config.is_empty:
+            return config
+        return None
+
+    def _search_from(
+        self,
+        from_dir: Path,
+        stop_dir: Path,
+        search_cache: Optional[Cache],
+        prefetched: Optional[Prefetched] = None,
+    ) -> Optional[CosmiconfigResult]:
+        # Walks up until a result is found (or cached), then caches it for
+        # every directory on the way. Other threads (with `thread_safe`) wait
+        # for the directories this walk claimed, and this walk waits for
+        # theirs. Walks only wait for ancestors, so they can't deadlock.
+        search_dependencies = self._search_dependencies
+        single_flight = self._single_flight if search_cache is not None else None
+        # Searched directories, nearest first, with what their own search
+        # depended on
+        visited: List[Tuple[str, Optional[Dependencies]]] = []
+        claimed: List[str] = []
+        # Dependencies of the cached result of an ancestor, if one was found
+        inherited: Optional[Dependencies] = []
 
-        extension = filepath.suffix
+        result: Any = MISSING
+        directory = from_dir
         try:
-            loader = self._config.loaders.get(
-                extension or "noExt", self._config.loaders.get("default", None)
+            while True:
+                key = str(directory)
+                if search_cache is not None:
+                    result = self._get_cached(search_cache, search_dependencies, key)
+                    if result is MISSING and single_flight is not None:
+                        in_flight = single_flight.claim((id(search_cache), key))
+                        if in_flight is not None:
+                            result = in_flight.result()
+                        else:
+                            claimed.append(key)
+                            # May have been cached before it was claimed.
+                            # Checked with `in` first, so that the miss above
+                            # isn't counted twice.
+                            if key in search_cache:
+                                result = self._get_cached(
+                                    search_cache, search_dependencies, key
+                                )
+                    if result is not MISSING:
+                        self._emit_cache_lookup(search_cache, key, hit=True)
+                        if search_dependencies is not None:
+                            inherited = search_dependencies.get(key, None)
+                        break
+
+                dependencies: Optional[Dependencies] = None
+                if search_dependencies is not None:
+                    dependencies = []
+                found = self._search_directory(directory, dependencies, prefetched)
+                visited.append((key, dependencies))
+                if found is not None:
+                    result = self._transform(found)
+                    break
+
+                parent_dir = directory.parent
+                if directory == stop_dir or directory == parent_dir:
+                    result = self._transform(None)
+                    break
+                directory = parent_dir
+
+            if search_cache is not None:
+                self._store_searches(search_cache, visited, result, inherited)
+        except BaseException as error:
+            # Keys are only claimed with a single flight
+            if single_flight is not None:
+                for key in claimed:
+                    single_flight.release((id(search_cache), key), error=error)
+            raise
+
+        if single_flight is not None:
+            for key in claimed:
+                single_flight.release((id(search_cache), key), result)
+        return result
+
+    def _store_searches(
+        self,
+        search_cache: Cache,
+        visited: List[Tuple[str, Optional[Dependencies]]],
+        result: Optional[CosmiconfigResult],
+        inherited: Optional[Dependencies],
+    ) -> None:
+        search_dependencies = self._search_dependencies
+        # Farthest first, as the result of a parent directory is also the
+        # result of its children, so children depend on everything the parent
+        # depends on
+        parent_dependencies = inherited
+        for key, dependencies in reversed(visited):
+            search_cache[key] = result
+            if search_dependencies is not None:
+                inherit_dependencies(dependencies, parent_dependencies)
+                search_dependencies[key] = dependencies
+                if self._watcher is not None:
+                    self._watch_entry(search_cache, search_dependencies, key)
+            self._emit_cache_lookup(search_cache, key, hit=False)
+            parent_dependencies = dependencies
+
+    def _search_directory(
+        self,
+        directory: Path,
+        dependencies: Optional[Dependencies] = None,
+        prefetched: Optional[Prefetched] = None,
+    ) -> Optional[CosmiconfigResult]:
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            instrumentation.emit(DIR_VISITED, str(directory))
+
+        places: Iterable[SearchPlace]
+        if prefetched is not None and directory in prefetched.listings:
+            places = _prefetched_result(prefetched.listings[directory], dependencies)
+        else:
+            places = self._list_search_places(directory, dependencies)
+
+        for place in places:
+            filepath = directory / place.path
+            if instrumentation is not None:
+                instrumentation.emit(FILE_PROBED, str(filepath))
+            try:
+                if prefetched is not None and filepath in prefetched.reads:
+                    prefetched_read = prefetched.reads[filepath]
+                    result = _prefetched_result(prefetched_read, dependencies)
+                    if prefetched.contents_only:
+                        result = self._load_contents(filepath, result, place=place)
+                else:
+                    result = self._read_configuration(
+                        filepath, dependencies, place=place
+                    )
+            except FileNotFoundError:
+                continue
+            except IsADirectoryError:
+                continue
+            except NotADirectoryError:
+                continue
+            if not (result.is_empty and self._config.ignore_empty_search_places):
+                return result
+        return None
+
+    def _read_configuration(
+        self,
+        filepath: Union[str, Path],
+        dependencies: Optional[Dependencies] = None,
+        loading_meta_config: bool = False,
+        place: Optional[SearchPlace] = None,
+    ) -> CosmiconfigResult:
+        filepath = Path(filepath)
+        contents = self._read_file(filepath, dependencies)
+        return self._load_contents(filepath, contents, loading_meta_config, place)
+
+    def _read_file(
+        self, filepath: Path, dependencies: Optional[Dependencies] = None
+    ) -> str:
+        # Fingerprint is taken before reading, so that changes made while
+        # reading invalidate the cache entry on next access.
+        add_dependency(dependencies, filepath)
+        instrumentation = self._instrumentation
+        if instrumentation is not None:
+            start = time.perf_counter()
+        with open(str(filepath), 'r') as f:
+            contents = f.read()
+        if instrumentation is not None:
+            instrumentation.emit(
+                FILE_READ, str(filepath), duration=time.perf_counter() - start
             )
-            if loader:
-                return loader(str(filepath), contents)
-        except Exception as error:
-            error.filepath = str(filepath)
-            raise error
-        raise ValueError(
-            f"No loader specified for {get_extension_description(extension)}"
+        return contents
+
+    def _load_contents(
+        self,
+        filepath: Path,
+        contents: str,
+        loading_meta_config: bool = False,
+        place: Optional[SearchPlace] = None,
+    ) -> CosmiconfigResult:
+        config = self._load_configuration(filepath, contents, place)
+        return self._to_cosmiconfig_result(str(filepath), config, loading_meta_config)
+
+    def _transform(
+        self, result: Optional[CosmiconfigResult]
+    ) -> Optional[CosmiconfigResult]:
+        # Async transforms are only accepted by `cosmiconfig_async()`
+        transform = cast(Transform, self._config.transform)
+        if self._instrumentation is None:
+            return self._freeze_result(transform(result))
+        start = time.perf_counter()
+        transformed = transform(result)
+        self._instrumentation.emit(
+            TRANSFORM,
+            result.filepath if result is not None else "",
+            duration=time.perf_counter() - start,
         )
+        return self._freeze_result(transformed)
+
+    def _load_configuration(
+        self, filepath: Path, contents: str, place: Optional[SearchPlace] = None
+    ) -> Optional[Config]:
+        steps = self._load_configuration_steps(filepath, contents, place)
+        try:
+            step = next(steps)
+            while True:
+                try:
+                    if step.is_parse:
+                        value = self._parse(step.fn, *step.args)
+                    else:
+                        value = step.fn(*step.args)
+                except Exception as error:
+                    step = steps.throw(error)
+                else:
+                    step = steps.send(value)
+        except StopIteration as stop:
+            return stop.value
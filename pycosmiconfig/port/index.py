@@ -1,13 +1,25 @@
 import os
-from typing import Optional, Union, List
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Union, List
 
+from pycosmiconfig.caches import CacheOption, CachePolicy, LRUCache
+from pycosmiconfig.instrumentation import EventSink
 from pycosmiconfig.utils import imdict
-from pycosmiconfig.port.types import Options, InternalOptions
+from pycosmiconfig.port.types import (
+    ConfigChange,
+    Options,
+    InternalOptions,
+    InternalOverrideOptions,
+)
 from pycosmiconfig.port.util import remove_none_values_from_object
 from pycosmiconfig.port.loaders import load_py, load_json, load_toml, load_yaml
 from pycosmiconfig.port.ExplorerSync import ExplorerSync
 from pycosmiconfig.port.types import Loaders, Transform
 
+# Imported by `cosmiconfig_async()`, as it pulls in asyncio
+if TYPE_CHECKING:
+    from pycosmiconfig.port.AsyncExplorer import AsyncExplorer
+
 
 # this needs to be hardcoded, as this is intended for end users,
 # who can't supply options at this point
@@ -36,51 +48,84 @@ default_loaders = imdict(
     }
 )
 
-# PORT COMMENT: No async loaders at the moment
+# PORT COMMENT: Default loaders are sync. `cosmiconfig_async()` runs them
+#               in the event loop's default executor.
 
 
 def _identity(x):
     return x
 
 
+# Meta config explorers by the directory they search (the working directory),
+# shared by all explorers created from it. Their caches are validated, so that
+# meta config files created or edited since are picked up. Bounded, like their
+# caches, as long-running processes may change the working directory often.
+_META_EXPLORERS_MAX_ENTRIES = 16
+_meta_explorers: LRUCache[str, ExplorerSync] = LRUCache(
+    max_entries=_META_EXPLORERS_MAX_ENTRIES
+)
+_meta_explorers_lock = threading.Lock()
+
+
+def _get_meta_explorer(cwd: str) -> ExplorerSync:
+    with _meta_explorers_lock:
+        meta_explorer = _meta_explorers.get(cwd, None)
+        if meta_explorer is None:
+            meta_explorer = ExplorerSync(
+                InternalOptions(
+                    package_prop="tool.pycosmiconfig",
+                    config_prop="pycosmiconfig",
+                    stop_dir=cwd,
+                    search_places=meta_search_places,
+                    ignore_empty_search_places=False,
+                    apply_package_property_path_to_configuration=True,
+                    loaders=default_loaders,
+                    transform=_identity,
+                    cache=CachePolicy(max_entries=_META_EXPLORERS_MAX_ENTRIES),
+                    validate_cache=True,
+                    thread_safe=True,
+                    persistent_cache=False,
+                    intern_configs=False,
+                    freeze_configs=False,
+                    watch=False,
+                    instrument=False,
+                    preserve_symlinks=False,
+                    meta_config_file_path=None,
+                )
+            )
+            _meta_explorers[cwd] = meta_explorer
+    return meta_explorer
+
+
 def _get_internal_options(module_name: str, options: Options):
-    InternalOptions.update_forward_refs()
-    meta_explorer = ExplorerSync(
-        InternalOptions(
-            package_prop="tool.pycosmiconfig",
-            config_prop="pycosmiconfig",
-            stop_dir=os.getcwd(),
-            search_places=meta_search_places,
-            ignore_empty_search_places=False,
-            apply_package_property_path_to_configuration=True,
-            loaders=default_loaders,
-            transform=_identity,
-            cache=True,
-            meta_config_file_path=None,
-        )
-    )
-    meta_config_result = meta_explorer.search()
+    if options.use_meta_config is False:
+        return InternalOptions.from_dict(options.dict())
+
+    cwd = os.getcwd()
+    meta_config_result = _get_meta_explorer(cwd).search(cwd)
 
     if not meta_config_result:
-        return InternalOptions(**options.dict())
+        return InternalOptions.from_dict(options.dict())
 
     meta_config = meta_config_result.config or {}
     if "loaders" in meta_config:
         raise ValueError("Can not specify loaders in meta config file")
 
-    override_options = InternalOptions(**meta_config)
+    # Meta config comes from a file, so it's validated like options given
+    # in code
+    override_options = InternalOverrideOptions(**meta_config).dict()
 
-    if override_options.search_places:
-        override_options.search_places = [
+    if override_options["search_places"]:
+        override_options["search_places"] = [
             path.replace("{name}", module_name)
-            for path in override_options.search_places
+            for path in override_options["search_places"]
         ]
 
-    override_options.meta_config_file_path = meta_config_result.filepath
+    override_options["meta_config_file_path"] = meta_config_result.filepath
 
     merged_options = {**options.dict()}
-    merged_options.update(remove_none_values_from_object(override_options.dict()))
-    return InternalOptions(**merged_options)
+    merged_options.update(remove_none_values_from_object(override_options))
+    return InternalOptions.from_dict(merged_options)
 
 
 def _normalize_options(module_name: str, options: InternalOptions):
@@ -110,38 +155,70 @@ def _normalize_options(module_name: str, options: InternalOptions):
         ignore_empty_search_places=True,
         stop_dir=os.path.expanduser("~"),
         cache=True,
+        validate_cache=False,
+        thread_safe=False,
+        persistent_cache=False,
+        intern_configs=False,
+        freeze_configs=False,
+        watch=False,
+        instrument=False,
+        preserve_symlinks=False,
         transform=_identity,
         loaders=default_loaders,
         meta_config_file_path=None,
     )
 
-    merged_loaders = defaults.loaders or {}
+    merged_loaders: Dict[str, Any] = dict(defaults.loaders)
     merged_loaders.update(options.loaders or {})
 
     merged_options = {**defaults.dict()}
     merged_options.update(remove_none_values_from_object(options.dict()))
     merged_options.update({"loaders": merged_loaders})
 
-    return InternalOptions(**merged_options)
+    return InternalOptions.from_dict(merged_options)
+
+
+def _get_explorer_options(module_name: str, options: Options) -> InternalOptions:
+    # PORT COMMENT: Handle the difference between prop in pyproject.toml
+    #               and elsewhere. `config_prop` is accepted so that
+    #               `Options(...).dict()` can be passed through as kwargs.
+    if options.package_prop is not None:
+        config_prop = options.config_prop
+        if config_prop is None:
+            config_prop = options.package_prop
+        options = options.copy(
+            update={
+                "config_prop": config_prop,
+                "package_prop": f"tool.{options.package_prop}",
+            }
+        )
+
+    internal_options = _get_internal_options(module_name, options)
+    return _normalize_options(module_name, internal_options)
 
 
-# PORT COMMENT: No async at the moment
 def cosmiconfig(
     module_name: str,
     package_prop: Optional[Union[str, List[str]]] = None,
     search_places: Optional[List[str]] = None,
     ignore_empty_search_places: Optional[bool] = None,
     stop_dir: Optional[str] = None,
-    cache: Optional[bool] = None,
+    cache: Optional[CacheOption] = None,
     loaders: Optional[Loaders] = None,
     transform: Optional[Transform] = None,
+    config_prop: Optional[Union[str, List[str]]] = None,
+    validate_cache: Optional[bool] = None,
+    thread_safe: Optional[bool] = None,
+    persistent_cache: Optional[bool] = None,
+    persistent_cache_dir: Optional[str] = None,
+    intern_configs: Optional[bool] = None,
+    freeze_configs: Optional[bool] = None,
+    use_meta_config: Optional[bool] = None,
+    watch: Optional[Union[bool, str]] = None,
+    on_change: Optional[Callable[[ConfigChange], None]] = None,
+    instrument: Optional[Union[bool, EventSink]] = None,
+    preserve_symlinks: Optional[bool] = None,
 ):
-    # PORT COMMENT: Handle the difference between prop in pyproject.toml
-    #               and elsewhere
-    config_prop = package_prop
-    package_prop = f'tool.{package_prop}'
-
-    Options.update_forward_refs()
     options = Options(
         package_prop=package_prop,
         config_prop=config_prop,
@@ -149,11 +226,42 @@ def cosmiconfig(
         ignore_empty_search_places=ignore_empty_search_places,
         stop_dir=stop_dir,
         cache=cache,
+        validate_cache=validate_cache,
+        thread_safe=thread_safe,
+        persistent_cache=persistent_cache,
+        persistent_cache_dir=persistent_cache_dir,
+        intern_configs=intern_configs,
+        freeze_configs=freeze_configs,
+        use_meta_config=use_meta_config,
+        watch=watch,
+        on_change=on_change,
+        instrument=instrument,
+        preserve_symlinks=preserve_symlinks,
         loaders=loaders,
         transform=transform,
     )
 
-    internal_options = _get_internal_options(module_name, options)
-    normalized_options = _normalize_options(module_name, internal_options)
-    explorer = ExplorerSync(normalized_options)
+    explorer = ExplorerSync(_get_explorer_options(module_name, options))
+    return explorer
+
+
+def cosmiconfig_async(module_name: str, **options: Any) -> "AsyncExplorer":
+    """
+    Like `cosmiconfig()`, but the returned explorer's `search()` and `load()`
+    are coroutines, and `loaders` and `transform` may be async functions.
+
+    Takes the same options as `cosmiconfig()`.
+    """
+    import inspect
+
+    from pycosmiconfig.port.AsyncExplorer import AsyncExplorer
+
+    # Reject options that `cosmiconfig()` doesn't know about
+    inspect.signature(cosmiconfig).bind(module_name, **options)
+    if options.get("watch", None):
+        raise ValueError("Option watch is not supported by cosmiconfig_async()")
+    if options.get("instrument", None):
+        raise ValueError("Option instrument is not supported by cosmiconfig_async()")
+
+    explorer = AsyncExplorer(_get_explorer_options(module_name, Options(**options)))
     return explorer
@@ -1,47 +1,321 @@
-import importlib
-from importlib.util import spec_from_file_location, module_from_spec
-import json
+import os
 from pathlib import Path
+import re
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Type, cast
 
-import toml
-import yaml
+
+class ParserBackend(NamedTuple):
+    """
+    @public
+
+    Parser used by a default loader. `errors` are the exceptions that `loads`
+    raises for malformed input. `version` is the version of the parser's
+    package, or `None` for parsers of the standard library.
+    """
+
+    name: str
+    loads: Callable[[str], Any]
+    errors: Tuple[Type[Exception], ...]
+    version: Optional[str] = None
+
+
+ParserBackendFactory = Callable[[], ParserBackend]
+
+# Parsers are imported only when a backend is created, i.e. when the loader
+# is first used, so that importing pycosmiconfig stays cheap.
+
+
+def _get_version(module: Any) -> Optional[str]:
+    version = getattr(module, "__version__", None)
+    return version if isinstance(version, str) else None
+
+
+def _tomllib_backend() -> ParserBackend:
+    import tomllib  # type: ignore[import-not-found]
+
+    return ParserBackend("tomllib", tomllib.loads, (tomllib.TOMLDecodeError,))
+
+
+def _tomli_backend() -> ParserBackend:
+    import tomli
+
+    return ParserBackend(
+        "tomli", tomli.loads, (tomli.TOMLDecodeError,), _get_version(tomli)
+    )
+
+
+def _toml_backend() -> ParserBackend:
+    import toml
+
+    return ParserBackend(
+        "toml", toml.loads, (toml.TomlDecodeError,), _get_version(toml)
+    )
+
+
+def _yaml_backend(loader_name: str) -> ParserBackend:
+    import yaml
+
+    # Raises AttributeError if PyYAML was built without libyaml
+    loader = getattr(yaml, loader_name)
+    return ParserBackend(
+        loader_name,
+        lambda content: yaml.load(content, Loader=loader),
+        (yaml.YAMLError,),
+        _get_version(yaml),
+    )
+
+
+# orjson parses integers over 64 bits as floats, `json` keeps them exact
+_long_number = re.compile(r"\d{19}")
+
+
+def _orjson_backend() -> ParserBackend:
+    import json
+
+    import orjson
+
+    def loads(content: str) -> Any:
+        if _long_number.search(content):
+            return json.loads(content)
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than `json` (e.g. no NaN), so let `json`
+            # decide if the content is valid.
+            return json.loads(content)
+
+    return ParserBackend("orjson", loads, (json.JSONDecodeError,), _get_version(orjson))
+
+
+def _json_backend() -> ParserBackend:
+    import json
+
+    return ParserBackend("json", json.loads, (json.JSONDecodeError,))
+
+
+# Parser backends of the default loaders, from the preferred (fastest) one.
+# The first backend that's installed is used. The last one is the reference
+# implementation, which is always installed. Backends must give the same
+# output as the reference one, except for the known differences listed in
+# the README ("Parser backends"): `toml` implements TOML 0.5, so it rejects
+# arrays of mixed types, and its offset datetimes have a `toml.tz.TomlTz`
+# instead of a `datetime.timezone`.
+parser_backend_factories: Dict[str, List[Tuple[str, ParserBackendFactory]]] = {
+    "toml": [
+        ("tomllib", _tomllib_backend),
+        ("tomli", _tomli_backend),
+        ("toml", _toml_backend),
+    ],
+    # PORT COMMENT: `CFullLoader` (libyaml) instead of `CSafeLoader`, as it
+    #               accepts the same documents as `FullLoader`.
+    "yaml": [
+        ("CFullLoader", lambda: _yaml_backend("CFullLoader")),
+        ("FullLoader", lambda: _yaml_backend("FullLoader")),
+    ],
+    "json": [
+        ("orjson", _orjson_backend),
+        ("json", _json_backend),
+    ],
+}
+"""@internal"""
+
+_parser_backends: Dict[str, ParserBackend] = {}
+
+
+def get_available_parser_backends(file_format: str) -> List[ParserBackend]:
+    """
+    @public
+
+    Returns all installed parser backends for `file_format` (`"toml"`,
+    `"yaml"` or `"json"`), from the preferred one.
+    """
+    backends = []
+    for _, factory in parser_backend_factories[file_format]:
+        try:
+            backends.append(factory())
+        except (ImportError, AttributeError):
+            continue
+    return backends
+
+
+def get_parser_backend(file_format: str) -> ParserBackend:
+    """
+    @public
+
+    Returns the parser backend used by the default loader for `file_format`.
+    """
+    backend = _parser_backends.get(file_format, None)
+    if backend is None:
+        # Only the preferred backend is created, so that the parsers of the
+        # others are not imported
+        for _, factory in parser_backend_factories[file_format]:
+            try:
+                backend = factory()
+                break
+            except (ImportError, AttributeError):
+                continue
+        else:
+            raise ImportError(f"No {file_format} parser backend is installed")
+        _parser_backends[file_format] = backend
+    return backend
+
+
+def set_parser_backend(file_format: str, name: str) -> None:
+    """
+    @public
+
+    Makes the default loader for `file_format` use the parser backend `name`,
+    e.g. `set_parser_backend("toml", "toml")`. Raises `ImportError` if the
+    backend is not installed.
+    """
+    factories = dict(parser_backend_factories[file_format])
+    if name not in factories:
+        raise ValueError(f'Unknown {file_format} parser backend "{name}"')
+    try:
+        _parser_backends[file_format] = factories[name]()
+    except AttributeError as error:
+        raise ImportError(str(error)) from error
+
+
+# Flags of PEP 552 hash-based pycs, whose hash is checked against the source
+_PYC_CHECKED_HASH = 0b11
+
+
+def _read_cached_code(cache_path: str, source_hash: bytes) -> Any:
+    import marshal
+    from importlib.util import MAGIC_NUMBER
+
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    flags = int.from_bytes(data[4:8], "little")
+    if (
+        data[:4] != MAGIC_NUMBER
+        or flags != _PYC_CHECKED_HASH
+        or data[8:16] != source_hash
+    ):
+        return None
+    try:
+        return marshal.loads(data[16:])
+    except (EOFError, ValueError, TypeError):
+        return None
+
+
+def _write_cached_code(cache_path: str, source_hash: bytes, code: Any) -> None:
+    import marshal
+    from importlib.util import MAGIC_NUMBER
+
+    data = b"".join(
+        [
+            MAGIC_NUMBER,
+            _PYC_CHECKED_HASH.to_bytes(4, "little"),
+            source_hash,
+            marshal.dumps(code),
+        ]
+    )
+    # Written to a temporary file first, so that concurrent processes never
+    # read a partially written file
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+
+def _compile_py(filepath: str, content: str) -> Any:
+    """
+    @internal
+
+    Compiles `content`, or reuses the code object compiled from the same
+    content by an earlier process. Code objects are kept where Python keeps
+    bytecode of imported modules (`__pycache__`), as hash-based pycs, so that
+    they stay valid as long as the content does, whatever its mtime.
+    """
+    from importlib.util import cache_from_source, source_hash
+
+    try:
+        cache_path = cache_from_source(filepath)
+    except (NotImplementedError, ValueError):
+        cache_path = None
+
+    # Typeshed of older mypy versions types the hash as `int`
+    content_hash = cast(bytes, source_hash(content.encode("utf-8")))
+    if cache_path is not None:
+        code = _read_cached_code(cache_path, content_hash)
+        if code is not None:
+            return code
+
+    # Compiled from the (already decoded) text, so that a coding declaration
+    # doesn't apply a second time
+    code = compile(content, filepath, "exec", dont_inherit=True)
+    if cache_path is not None and not sys.dont_write_bytecode:
+        _write_cached_code(cache_path, content_hash, code)
+    return code
 
 
 # PORT COMMENT: We import from Py files instead of JS files,
 #               and the imported Py file must expose a "config" variable.
 def load_py(filepath: str, content: str):
-    # Try to import file as module
-    try:
-        module = importlib.import_module(filepath)
-        return module.config
-    except ModuleNotFoundError:
-        pass
+    from importlib.util import spec_from_file_location, module_from_spec
 
-    # Otherwise try to import file as python source file
-    # See https://stackoverflow.com/a/54956419/9788634
+    # Run as a module named after the file, like a plain import would, but
+    # from the given content instead of reading the file again
     modulename = Path(filepath).stem
     spec = spec_from_file_location(modulename, filepath)
     module = module_from_spec(spec)
-    spec.loader.exec_module(module)
+    exec(_compile_py(filepath, content), module.__dict__)
     return module.config
 
 
 def load_json(filepath: str, content: str):
+    backend = get_parser_backend("json")
     try:
-        return json.loads(content)
-    except json.JSONDecodeError as e:
+        return backend.loads(content)
+    except backend.errors as e:
         raise ValueError(f"JSON Error in {filepath}:\n{str(e)}")
 
 
 def load_yaml(filepath: str, content: str):
+    backend = get_parser_backend("yaml")
     try:
-        return yaml.load(content, Loader=yaml.FullLoader)
-    except yaml.YAMLError as e:
+        return backend.loads(content)
+    except backend.errors as e:
         raise ValueError(f"YAML Error in {filepath}:\n{str(e)}")
 
 
 def load_toml(filepath: str, content: str):
+    backend = get_parser_backend("toml")
     try:
-        return toml.loads(content)
-    except toml.TomlDecodeError as e:
+        return backend.loads(content)
+    except backend.errors as e:
         raise ValueError(f"TOML Error in {filepath}:\n{str(e)}")
+
+
+# Default loaders, by the file format whose parser backend they use
+_default_loader_formats: Tuple[Tuple[Callable[..., Any], str], ...] = (
+    (load_json, "json"),
+    (load_yaml, "yaml"),
+    (load_toml, "toml"),
+)
+
+
+def get_loader_parser_backend(loader: Callable[..., Any]) -> Optional[ParserBackend]:
+    """
+    @internal
+
+    Returns the parser backend that `loader` uses if it's a default loader,
+    otherwise `None`.
+    """
+    for default_loader, file_format in _default_loader_formats:
+        if loader is default_loader:
+            return get_parser_backend(file_format)
+    return None
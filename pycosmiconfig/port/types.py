@@ -1,34 +1,98 @@
+import copy
+from dataclasses import dataclass, fields
 from typing import (
+    Awaitable,
+    Iterator,
+    Tuple,
     Optional,
     Callable,
     Union,
     List,
     Dict,
     Any,
+    Iterable,
     Protocol,
     runtime_checkable,
 )
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, StrictBool, StrictInt
+
+from pycosmiconfig.caches import CacheFactory, CachePolicy, CacheProtocol, CacheStats
+from pycosmiconfig.instrumentation import EventSink, ExplorerStats
 
 
 Config = Any
 """@public"""
 
 
-class CosmiconfigResult(BaseModel):
-    """@public"""
+class CosmiconfigResult:
+    """
+    @public
+
+    PORT COMMENT: Not a pydantic model, as one is created for every lookup
+                  and its fields need no validation. Keeps the API of the
+                  model: keyword arguments, attribute access, `==`, `dict()`
+                  and `copy()`.
+    """
+
+    __slots__ = ("config", "filepath", "is_empty")
+
+    def __init__(
+        self, *, config: Config, filepath: str, is_empty: Optional[bool] = None
+    ) -> None:
+        self.config = config
+        self.filepath = filepath
+        self.is_empty = is_empty
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "config": self.config,
+            "filepath": self.filepath,
+            "is_empty": self.is_empty,
+        }
+
+    def copy(
+        self, update: Optional[Dict[str, Any]] = None, deep: bool = False
+    ) -> "CosmiconfigResult":
+        values = self.dict()
+        if deep:
+            values = copy.deepcopy(values)
+        values.update(update or {})
+        return CosmiconfigResult(**values)
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        return iter(self.dict().items())
 
-    config: Config
-    filepath: str
-    is_empty: Optional[bool] = Field(default=None)
+    def __eq__(self, other: object) -> bool:
+        # Same as pydantic models, which compare to dicts too
+        if isinstance(other, CosmiconfigResult):
+            return self.dict() == other.dict()
+        return self.dict() == other
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self)
+        return f"CosmiconfigResult({fields})"
+
+
+class ConfigChange(BaseModel):
+    """
+    @public
+
+    Passed to the `on_change` callback when a change of the file or directory
+    `path` evicted cached results. `loads` are the file paths evicted from the
+    load cache, `searches` the directories evicted from the search cache (or
+    whose own config, used by `search_all()`, was evicted).
+    """
+
+    path: str
+    loads: List[str]
+    searches: List[str]
 
 
 LoaderResult = Optional[Config]
 """@public"""
 
 
-# PORT COMMENT: No async at the moment
 @runtime_checkable
 class Loader(Protocol):
     """@public"""
@@ -37,7 +101,18 @@ class Loader(Protocol):
         ...
 
 
-# PORT COMMENT: No async at the moment
+@runtime_checkable
+class AsyncLoader(Protocol):
+    """
+    @public
+
+    Only supported by `cosmiconfig_async()`.
+    """
+
+    def __call__(self, filepath: str, content: str) -> Awaitable[LoaderResult]:
+        ...
+
+
 @runtime_checkable
 class Transform(Protocol):
     """@public"""
@@ -48,6 +123,20 @@ class Transform(Protocol):
         ...
 
 
+@runtime_checkable
+class AsyncTransform(Protocol):
+    """
+    @public
+
+    Only supported by `cosmiconfig_async()`.
+    """
+
+    def __call__(
+        self, cosmiconfig_result: Optional[CosmiconfigResult]
+    ) -> Awaitable[Optional[CosmiconfigResult]]:
+        ...
+
+
 class CommonOptions(BaseModel):
     """@public"""
 
@@ -60,40 +149,83 @@ class CommonOptions(BaseModel):
     search_places: Optional[List[str]] = Field(default=None)
     ignore_empty_search_places: Optional[bool] = Field(default=None)
     stop_dir: Optional[str] = Field(default=None)
-    cache: Optional[bool] = Field(default=None)
+    # Strict, so that e.g. `1` is not taken for `True`
+    cache: Optional[Union[StrictBool, StrictInt, CachePolicy, CacheFactory]] = Field(
+        default=None
+    )
+    validate_cache: Optional[bool] = Field(default=None)
+    thread_safe: Optional[bool] = Field(default=None)
+    persistent_cache: Optional[bool] = Field(default=None)
+    persistent_cache_dir: Optional[str] = Field(default=None)
+    intern_configs: Optional[bool] = Field(default=None)
+    freeze_configs: Optional[bool] = Field(default=None)
+    watch: Optional[Union[StrictBool, str]] = Field(default=None)
+    preserve_symlinks: Optional[bool] = Field(default=None)
+
+    class Config:
+        arbitrary_types_allowed = True
 
 
-# PORT COMMENT: No async at the moment
 class Options(CommonOptions):
     """@public"""
 
-    loaders: Optional["Loaders"] = Field(default=None)
-    transform: Optional[Transform] = Field(default=None)
+    # Not part of `CommonOptions`, as it can't be set from the meta config
+    use_meta_config: Optional[bool] = Field(default=None)
+    on_change: Optional[Callable[[ConfigChange], None]] = Field(default=None)
+    instrument: Optional[Union[StrictBool, EventSink]] = Field(default=None)
+
+    loaders: Optional[Union["Loaders", "AsyncLoaders"]] = Field(default=None)
+    transform: Optional[Union[Transform, AsyncTransform]] = Field(default=None)
 
     class Config:
         arbitrary_types_allowed = True
 
 
-# PORT COMMENT: No async at the moment
-class InternalOptions(BaseModel):
-    """@internal"""
+@dataclass(frozen=True)
+class InternalOptions:
+    """
+    @internal
 
-    apply_package_property_path_to_configuration: Optional[bool] = Field(default=None)
-    meta_config_file_path: Optional[str] = Field(default=None)
+    PORT COMMENT: Frozen dataclass instead of a pydantic model, as the values
+                  are already validated by `Options` (or `InternalOverrideOptions`
+                  for the meta config).
+    """
+
+    apply_package_property_path_to_configuration: Optional[bool] = None
+    meta_config_file_path: Optional[str] = None
 
     # PORT COMMENT: The below is equivalent to `Required<Options>`
     # PORT COMMENT 2: `config_prop` is our custom field.
-    config_prop: Optional[Union[str, List[str]]] = Field(default=None)
-    package_prop: Union[str, List[str]] = Field(default=None)
-    search_places: List[str] = Field(default=None)
-    ignore_empty_search_places: bool = Field(default=None)
-    stop_dir: str = Field(default=None)
-    cache: bool = Field(default=None)
-    loaders: "Loaders" = Field(default=None)
-    transform: Transform = Field(default=None)
-
-    class Config:
-        arbitrary_types_allowed = True
+    config_prop: Optional[Union[str, List[str]]] = None
+    package_prop: Union[str, List[str]] = None  # type: ignore[assignment]
+    search_places: List[str] = None  # type: ignore[assignment]
+    ignore_empty_search_places: bool = None  # type: ignore[assignment]
+    stop_dir: str = None  # type: ignore[assignment]
+    cache: Union[bool, int, CachePolicy, CacheFactory] = None  # type: ignore
+    validate_cache: bool = None  # type: ignore[assignment]
+    thread_safe: bool = None  # type: ignore[assignment]
+    persistent_cache: bool = None  # type: ignore[assignment]
+    persistent_cache_dir: Optional[str] = None
+    intern_configs: bool = None  # type: ignore[assignment]
+    freeze_configs: bool = None  # type: ignore[assignment]
+    watch: Union[bool, str] = None  # type: ignore[assignment]
+    preserve_symlinks: bool = None  # type: ignore[assignment]
+    on_change: Optional[Callable[[ConfigChange], None]] = None
+    instrument: Union[bool, EventSink] = None  # type: ignore[assignment]
+    loaders: Union["Loaders", "AsyncLoaders"] = None  # type: ignore[assignment]
+    transform: Union[Transform, AsyncTransform] = None  # type: ignore[assignment]
+
+    @classmethod
+    def from_dict(cls, values: Dict[str, Any]) -> "InternalOptions":
+        """Creates options from `values`, ignoring unknown keys."""
+        return cls(**{key: values[key] for key in _internal_option_names & set(values)})
+
+    def dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in _internal_option_names_ordered}
+
+
+_internal_option_names_ordered = [field.name for field in fields(InternalOptions)]
+_internal_option_names = set(_internal_option_names_ordered)
 
 
 # PORT COMMENT: Defined separately from InternalOptions because
@@ -105,22 +237,41 @@ class InternalOverrideOptions(Options):
     meta_config_file_path: Optional[str] = Field(default=None)
 
 
-# PORT COMMENT: No async at the moment
-Cache = Dict[str, Optional[CosmiconfigResult]]
-"""@internal"""
+Cache = CacheProtocol
+"""
+@internal
+
+Cache of an explorer, as created for its `cache` option (e.g. an `LRUCache`).
+Search and load caches hold results (`Optional[CosmiconfigResult]`) by path.
+"""
+
+
+AsyncCache = CacheProtocol
+"""
+@internal
+
+Cache of an async explorer, which holds futures of what the `Cache` of a sync
+explorer holds (`asyncio.Future[Optional[CosmiconfigResult]]`).
+"""
 
 
-# PORT COMMENT: No async at the moment
 Loaders = Dict[str, Loader]
 """@public"""
 
 
+AsyncLoaders = Dict[str, Union[Loader, AsyncLoader]]
+"""@public"""
+
+
 class PublicExplorerBase(BaseModel):
     """@public"""
 
     clear_load_cache: Callable[[], None]
     clear_search_cache: Callable[[], None]
     clear_caches: Callable[[], None]
+    cache_stats: Callable[[], Dict[str, CacheStats]]
+    stats: Callable[[], Optional[ExplorerStats]]
+    close: Callable[[], None]
 
 
 @runtime_checkable
@@ -129,18 +280,40 @@ class PublicExplorerSearchFn(Protocol):
         ...
 
 
+@runtime_checkable
+class PublicExplorerSearchManyFn(Protocol):
+    def __call__(
+        self, search_from: Iterable[str]
+    ) -> Dict[str, Optional[CosmiconfigResult]]:
+        ...
+
+
+@runtime_checkable
+class PublicExplorerSearchAllFn(Protocol):
+    def __call__(self, search_from: Optional[str]) -> List[CosmiconfigResult]:
+        ...
+
+
 @runtime_checkable
 class PublicExplorerLoadFn(Protocol):
     def __call__(self, filepath: str) -> Optional[CosmiconfigResult]:
         ...
 
 
-# PORT COMMENT: No async at the moment
+# PORT COMMENT: Sync explorer only, `cosmiconfig_async()` returns an
+#               `AsyncExplorer` instead
 class PublicExplorer(PublicExplorerBase):
     """@public"""
 
     search: PublicExplorerSearchFn
+    search_many: PublicExplorerSearchManyFn
+    search_all: PublicExplorerSearchAllFn
+    search_merged: PublicExplorerSearchFn
     load: PublicExplorerLoadFn
 
     class Config:
         arbitrary_types_allowed = True
+
+
+Options.update_forward_refs()
+InternalOverrideOptions.update_forward_refs()
@@ -1,19 +1,284 @@
-from typing import Any, Dict, List, Union, TypeVar, Callable, Optional
+import os
+import threading
+from collections.abc import Mapping
+from pathlib import Path, PurePath
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Dict,
+    FrozenSet,
+    Hashable,
+    List,
+    Tuple,
+    Union,
+    TypeVar,
+    Callable,
+    Optional,
+)
+
+# `caches` uses `MISSING` of this module
+if TYPE_CHECKING:
+    from pycosmiconfig.caches import CacheProtocol
 
-K = TypeVar("K")
 V = TypeVar("V")
 
+Fingerprint = Tuple[int, int, int]
+"""@internal"""
+
+Dependencies = List[Tuple[str, Optional[Fingerprint]]]
+"""@internal"""
+
+# PORT COMMENT: JS version distinguishes between `undefined` (not cached)
+#               and `null` (cached "nothing found"). We use a sentinel instead.
+MISSING: Any = object()
+"""
+@internal
+
+Default of cache lookups, which tells apart entries that are not cached from
+cached `None`. The one sentinel of all caches (in memory and persistent).
+"""
+
 
-def emplace(cache: Dict[K, V], key: K, fn: Callable[[], V]) -> V:
+def emplace(cache: "CacheProtocol", key: Hashable, fn: Callable[[], V]) -> V:
     """@internal"""
-    cached = cache.get(key, None)
-    if cached is not None:
+    cached = cache.get(key, MISSING)
+    if cached is not MISSING:
         return cached
     result = fn()
     cache[key] = result
     return result
 
 
+def emplace_validated(
+    cache: "CacheProtocol",
+    dependencies: "CacheProtocol",
+    key: Hashable,
+    fn: Callable[[Dependencies], V],
+    validate: bool = True,
+) -> V:
+    """
+    @internal
+
+    Like `emplace`, but the cached value is reused only if none of the files
+    or directories it was computed from changed since. `fn` receives a list
+    to which it appends the paths (and their fingerprints) it depends on.
+
+    With `validate=False` the dependencies are only recorded, e.g. for entries
+    that are evicted by a watcher instead.
+    """
+    cached = get_validated(cache, dependencies, key, MISSING, validate)
+    if cached is not MISSING:
+        return cached
+    key_dependencies: Dependencies = []
+    result = fn(key_dependencies)
+    cache[key] = result
+    dependencies[key] = key_dependencies
+    return result
+
+
+def get_validated(
+    cache: "CacheProtocol",
+    dependencies: "CacheProtocol",
+    key: Hashable,
+    default: Any = None,
+    validate: bool = True,
+) -> Any:
+    """
+    @internal
+
+    Returns the cached value of `key`, or `default` if it's not cached or (with
+    `validate`) any of its dependencies changed since. Stale entries are
+    removed, so that caches that count their lookups count them as misses.
+    """
+    if (
+        validate
+        and key in cache
+        and not are_dependencies_fresh(dependencies.get(key, None))
+    ):
+        try:
+            del cache[key]
+        except KeyError:
+            pass
+    return cache.get(key, default)
+
+
+async def emplace_async(
+    cache: "CacheProtocol",
+    key: Hashable,
+    fn: Callable[[Optional[Dependencies]], Awaitable[V]],
+    dependencies: Optional["CacheProtocol"] = None,
+) -> V:
+    """
+    @internal
+
+    Async counterpart of `emplace` and `emplace_validated`. The cache holds
+    futures, so concurrent calls for the same key await the same computation.
+    Failed computations are removed from the cache.
+    """
+    import asyncio
+
+    cached = cache.get(key, None)
+    if cached is not None:
+        if dependencies is None or not cached.done():
+            return await asyncio.shield(cached)
+        loop = asyncio.get_running_loop()
+        key_dependencies = dependencies.get(key, None)
+        if await loop.run_in_executor(None, are_dependencies_fresh, key_dependencies):
+            return await asyncio.shield(cached)
+
+    new_dependencies: Optional[Dependencies] = None
+    if dependencies is not None:
+        new_dependencies = dependencies[key] = []
+    future = asyncio.ensure_future(fn(new_dependencies))
+    cache[key] = future
+
+    def evict_on_error(done: "asyncio.Future[V]") -> None:
+        if done.cancelled() or done.exception() is not None:
+            if cache.get(key, None) is done:
+                del cache[key]
+
+    future.add_done_callback(evict_on_error)
+    # Shielded, so that cancelling one caller doesn't cancel the others
+    return await asyncio.shield(future)
+
+
+class Flight:
+    """
+    @internal
+
+    Result (or error) of a call that other threads wait for. Same as
+    `concurrent.futures.Future`, which is slow to import, for what
+    `SingleFlight` needs.
+    """
+
+    __slots__ = ("_done", "_result", "_error")
+
+    def __init__(self) -> None:
+        self._done = threading.Event()
+        self._result: Any = None
+        self._error: Optional[BaseException] = None
+
+    def result(self) -> Any:
+        """Waits for the call to finish. Returns its result, or raises its error."""
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+    def set_result(self, result: Any) -> None:
+        self._result = result
+        self._done.set()
+
+    def set_exception(self, error: BaseException) -> None:
+        self._error = error
+        self._done.set()
+
+
+class SingleFlight:
+    """
+    @internal
+
+    Deduplicates concurrent calls: while `fn` runs for a key, other threads
+    calling `run()` with the same key wait for its result (or error) instead
+    of calling their own `fn`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Flight] = {}
+
+    def run(self, key: Hashable, fn: Callable[[], V]) -> V:
+        in_flight = self.claim(key)
+        if in_flight is not None:
+            return in_flight.result()
+
+        try:
+            result = fn()
+        except BaseException as error:
+            self.release(key, error=error)
+            raise
+        self.release(key, result)
+        return result
+
+    def claim(self, key: Hashable) -> Optional[Flight]:
+        """
+        Returns the flight of the thread that runs `key`, or `None` if there
+        is none and the caller now runs it. The caller must then `release()`
+        the key, also when failing.
+        """
+        with self._lock:
+            in_flight = self._in_flight.get(key, None)
+            if in_flight is None:
+                self._in_flight[key] = Flight()
+        return in_flight
+
+    def release(
+        self, key: Hashable, result: Any = None, error: Optional[BaseException] = None
+    ) -> None:
+        """Passes the result (or error) of a claimed key to waiting threads."""
+        with self._lock:
+            flight = self._in_flight.pop(key)
+        if error is not None:
+            flight.set_exception(error)
+        else:
+            flight.set_result(result)
+
+
+def get_fingerprint(path: Union[str, Path]) -> Optional[Fingerprint]:
+    """
+    @internal
+
+    Returns `(st_mtime_ns, st_size, st_ino)` of `path`, or `None` if it cannot
+    be stat-ed (e.g. it does not exist).
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def add_dependency(
+    dependencies: Optional[Dependencies], path: Union[str, Path]
+) -> None:
+    """@internal"""
+    if dependencies is not None:
+        dependencies.append((str(path), get_fingerprint(path)))
+
+
+# Dependency that is never fresh, as no path has this fingerprint
+_STALE_DEPENDENCY: Tuple[str, Optional[Fingerprint]] = ("", (-1, -1, -1))
+
+
+def inherit_dependencies(
+    dependencies: Optional[Dependencies],
+    parent_dependencies: Optional[Dependencies],
+) -> None:
+    """
+    @internal
+
+    Adds the dependencies of a parent cache entry to those of a child entry.
+    If the parent's dependencies were evicted in the meantime, the child is
+    marked stale, so it is recomputed on next access.
+    """
+    if dependencies is None:
+        return
+    if parent_dependencies is None:
+        dependencies.append(_STALE_DEPENDENCY)
+    else:
+        dependencies.extend(parent_dependencies)
+
+
+def are_dependencies_fresh(dependencies: Optional[Dependencies]) -> bool:
+    """@internal"""
+    if dependencies is None:
+        return False
+    return all(
+        get_fingerprint(path) == fingerprint for path, fingerprint in dependencies
+    )
+
+
 def get_property_by_path(source: Dict[str, Any], path: Union[str, List[str]]) -> Any:
     """
     @internal
@@ -40,6 +305,55 @@ def get_property_by_path(source: Dict[str, Any], path: Union[str, List[str]]) ->
     return previous
 
 
+def merge_configs(base: Any, override: Any) -> Any:
+    """
+    @internal
+
+    Deep-merges config `override` onto config `base`, without changing either.
+    Mappings are merged key by key (into dicts), any other value of `override`
+    replaces the one of `base`. Values that `override` doesn't change are
+    shared with `base` instead of copied, so only the dicts on the paths to
+    overridden values are new.
+    """
+    if not isinstance(base, Mapping) or not isinstance(override, Mapping):
+        return override
+    merged = dict(base)
+    for key, value in override.items():
+        merged[key] = merge_configs(merged[key], value) if key in merged else value
+    return merged
+
+
+# Characters that TOML keys can only contain escaped, if quoted with `"`
+_TOML_ESCAPED_CHARACTERS = frozenset(['"', "\\", "\x7f", *map(chr, range(32))])
+# Escapes that can spell any character
+_TOML_CODE_POINT_ESCAPES = ("\\u", "\\U", "\\x")
+
+
+def may_define_property(contents: str, path: Union[str, List[str]]) -> bool:
+    """
+    @internal
+
+    Checks without parsing whether TOML document `contents` may define the
+    property at `path` (as looked up by `get_property_by_path`). Every key on
+    the path has to be spelled out in the document, be it bare, quoted or in
+    a table header, so the document can't define the property if any key is
+    missing from its text.
+
+    Keys can also be spelled with `\\u`, `\\U` (and in TOML 1.1 `\\x`) escapes,
+    and keys with quotes or control characters only with escapes, so in these
+    cases this returns `True`, as it does whenever the property may be defined.
+    """
+    if any(escape in contents for escape in _TOML_CODE_POINT_ESCAPES):
+        return True
+    keys = path.split(".") if isinstance(path, str) else path
+    for key in keys:
+        if not isinstance(key, str) or not _TOML_ESCAPED_CHARACTERS.isdisjoint(key):
+            return True
+        if key not in contents:
+            return False
+    return True
+
+
 def remove_none_values_from_object(
     options: Optional[Dict[str, Any]]
 ) -> Optional[Dict[str, Any]]:
@@ -47,3 +361,102 @@ def remove_none_values_from_object(
     if options is None:
         return None
     return {key: value for key, value in options.items() if value is not None}
+
+
+DirListings = Dict[str, Optional[FrozenSet[str]]]
+"""
+@internal
+
+Names in (sub)directories by subdirectory, as listed by `is_place_listed()`:
+the names of all entries, and their casefolded forms.
+"""
+
+
+def list_dir(dirpath: Union[str, Path]) -> Optional[FrozenSet[str]]:
+    """
+    @internal
+
+    Returns names of all entries in `dirpath` using a single `os.scandir` call.
+
+    Returns an empty set if `dirpath` does not exist or is not a directory,
+    and `None` if it exists but cannot be listed.
+    """
+    try:
+        with os.scandir(dirpath) as entries:
+            return frozenset(entry.name for entry in entries)
+    except (FileNotFoundError, NotADirectoryError):
+        return frozenset()
+    except OSError:
+        return None
+
+
+PlaceLookups = Tuple[Tuple[str, str], ...]
+"""
+@internal
+
+`(subdirectory, name)` pairs to look up in directory listings to find a search
+place, e.g. `(("", ".config"), (".config", "foorc"))` for `.config/foorc`.
+"""
+
+
+def get_place_lookups(place: str) -> Optional[PlaceLookups]:
+    """
+    @internal
+
+    Returns the listing lookups of search place `place`, or `None` if it
+    cannot be looked up in listings (absolute, or containing `..`).
+    """
+    place_path = PurePath(place)
+    if place_path.is_absolute() or ".." in place_path.parts:
+        return None
+
+    lookups: List[Tuple[str, str]] = []
+    subdir = ""
+    for part in place_path.parts:
+        lookups.append((subdir, part))
+        subdir = os.path.join(subdir, part)
+    return tuple(lookups)
+
+
+def is_place_listed(
+    directory: Path,
+    lookups: Optional[PlaceLookups],
+    listings: DirListings,
+    dependencies: Optional[Dependencies] = None,
+) -> bool:
+    """
+    @internal
+
+    Checks against directory listings whether the search place with `lookups`
+    (see `get_place_lookups()`) may exist in `directory`. Each (sub)directory
+    is listed at most once per `listings`, and is recorded in `dependencies`
+    (if given) before it is listed.
+
+    Returns `True` whenever this cannot be decided from the listings (e.g.
+    directory cannot be listed, or the place is not a plain relative path),
+    so that the caller falls back to opening the file.
+
+    Names are also matched case-insensitively, as opening the file finds an
+    entry of another case on case-insensitive filesystems (e.g. on macOS and
+    Windows). Where that fails (case-sensitive filesystems), opening the file
+    fails as it would without the listing.
+    """
+    if lookups is None:
+        return directory.is_dir()
+
+    for subdir, name in lookups:
+        names = listings.get(subdir, MISSING)
+        if names is MISSING:
+            add_dependency(dependencies, directory / subdir)
+            names = listings[subdir] = _add_casefolded(list_dir(directory / subdir))
+        if names is None:
+            return True
+        if name not in names and name.casefold() not in names:
+            return False
+    return True
+
+
+def _add_casefolded(names: Optional[FrozenSet[str]]) -> Optional[FrozenSet[str]]:
+    if names is None:
+        return None
+    return names.union([name.casefold() for name in names])
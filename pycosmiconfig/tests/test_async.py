@@ -0,0 +1,107 @@
+import asyncio
+import os
+import pytest
+
+from pycosmiconfig import cosmiconfig, cosmiconfig_async, load_yaml
+from util import TempDir
+
+
+@pytest.fixture(autouse=True)
+def temp():
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+
+    current_dir = os.getcwd()
+    os.chdir(temp_dir.dir)
+    yield temp_dir
+    os.chdir(current_dir)
+    temp_dir.delete_temp_dir()
+
+
+def describe_cosmiconfig_async():
+    def test_rejects_unknown_options():
+        with pytest.raises(TypeError):
+            cosmiconfig_async("foo", stop_dirr=".")
+
+    def test_search_same_as_sync(temp: TempDir):
+        temp.create_file("pyproject.toml", "[tool.foo]\na = 1")
+        temp.create_file("pkg/.config/foorc.json", '{"a": 2}')
+        temp.create_dir("pkg/src")
+        temp.create_dir("other")
+        start_dirs = ["pkg/src", "pkg", "other", "."]
+
+        sync_explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+        async_explorer = cosmiconfig_async("foo", stop_dir=str(temp.dir))
+
+        async def search_all():
+            return [await async_explorer.search(d) for d in start_dirs]
+
+        expected = [sync_explorer.search(d) for d in start_dirs]
+        assert asyncio.run(search_all()) == expected
+        assert asyncio.run(async_explorer.search_many(start_dirs)) == dict(
+            zip(start_dirs, expected)
+        )
+
+    def test_load_raises_loader_errors(temp: TempDir):
+        temp.create_file(".foorc.json", "{ invalid")
+        explorer = cosmiconfig_async("foo", stop_dir=str(temp.dir))
+
+        with pytest.raises(ValueError, match="JSON Error"):
+            asyncio.run(explorer.load(".foorc.json"))
+
+    def test_supports_async_loaders_and_transforms(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+
+        async def loader(filepath: str, content: str):
+            await asyncio.sleep(0)
+            return load_yaml(filepath, content)
+
+        async def transform(result):
+            await asyncio.sleep(0)
+            result.config["transformed"] = True
+            return result
+
+        explorer = cosmiconfig_async(
+            "foo",
+            stop_dir=str(temp.dir),
+            loaders={".yaml": loader},
+            transform=transform,
+        )
+        result = asyncio.run(explorer.search())
+
+        assert result.config == {"a": "b", "transformed": True}
+
+    def test_deduplicates_concurrent_searches(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_dir("a/b")
+        calls = []
+
+        async def loader(filepath: str, content: str):
+            calls.append(filepath)
+            await asyncio.sleep(0.01)
+            return load_yaml(filepath, content)
+
+        explorer = cosmiconfig_async(
+            "foo", stop_dir=str(temp.dir), loaders={".yaml": loader}
+        )
+
+        async def search_concurrently():
+            return await asyncio.gather(
+                *(explorer.search(d) for d in ["a/b", "a", "."] * 4)
+            )
+
+        results = asyncio.run(search_concurrently())
+
+        assert calls == [str(temp.absolute_path(".foorc.yaml"))]
+        assert all(result is results[0] for result in results)
+
+    def test_does_not_cache_errors(temp: TempDir):
+        temp.create_file(".foorc.json", "{ invalid")
+        explorer = cosmiconfig_async("foo", stop_dir=str(temp.dir))
+
+        with pytest.raises(ValueError):
+            asyncio.run(explorer.search())
+        temp.create_file(".foorc.json", '{"a": "b"}')
+
+        assert asyncio.run(explorer.search()).config == {"a": "b"}
@@ -0,0 +1,412 @@
+import asyncio
+import builtins
+import os
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+from pycosmiconfig import (
+    CachePolicy,
+    CacheStats,
+    LRUCache,
+    cosmiconfig,
+    cosmiconfig_async,
+    load_yaml,
+)
+from pycosmiconfig.port import loaders
+from pycosmiconfig.port.ExplorerBase import pyproject_documents
+from util import TempDir
+
+
+@pytest.fixture(autouse=True)
+def temp():
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+
+    current_dir = os.getcwd()
+    os.chdir(temp_dir.dir)
+    yield temp_dir
+    os.chdir(current_dir)
+    temp_dir.delete_temp_dir()
+
+
+def describe_load_cache():
+    def test_reuses_cached_result(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+        file = str(temp.absolute_path(".foorc.yaml"))
+
+        with patch.object(builtins, "open", wraps=builtins.open) as open_spy:
+            first = explorer.load(file)
+            second = explorer.load(file)
+
+            assert temp.get_spy_path_calls(open_spy) == [".foorc.yaml"]
+            assert first is second
+
+
+def describe_cache_policy():
+    def test_evicts_least_recently_used_entries(temp: TempDir):
+        for name in ["a", "b", "c"]:
+            temp.create_file(f"{name}/.foorc.yaml", f"name: {name}")
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), cache=CachePolicy(max_entries=2)
+        )
+        files = {name: str(temp.absolute_path(f"{name}/.foorc.yaml")) for name in "abc"}
+
+        a = explorer.load(files["a"])
+        explorer.load(files["b"])
+        assert explorer.load(files["a"]) is a
+        explorer.load(files["c"])
+
+        assert explorer.load(files["a"]) is a
+        assert explorer.cache_stats()["load"] == CacheStats(
+            hits=2, misses=3, evictions=1, size=2
+        )
+
+    def test_counts_each_search_miss_once_when_thread_safe(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_dir("a/b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), thread_safe=True)
+
+        explorer.search("a/b")
+
+        assert explorer.cache_stats()["search"].misses == 3
+
+    def test_counts_stale_entries_as_misses(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), validate_cache=True)
+        file = str(temp.absolute_path(".foorc.yaml"))
+
+        explorer.load(file)
+        temp.create_file(".foorc.yaml", "a: changed")
+        assert explorer.load(file).config == {"a": "changed"}
+
+        stats = explorer.cache_stats()["load"]
+        assert (stats.hits, stats.misses) == (0, 2)
+
+    def test_accepts_max_entries_as_int(temp: TempDir):
+        temp.create_file("a/.foorc.yaml", "a: b")
+        temp.create_file("b/.foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), cache=1)
+
+        explorer.search("a")
+        explorer.search("b")
+
+        assert explorer.cache_stats()["search"].size == 1
+
+    def test_expires_entries_after_ttl(temp: TempDir):
+        now = [0.0]
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            cache=lambda: LRUCache(ttl=10, clock=lambda: now[0]),
+        )
+        file = str(temp.absolute_path(".foorc.yaml"))
+
+        first = explorer.load(file)
+        now[0] = 9
+        assert explorer.load(file) is first
+        now[0] = 10
+        assert explorer.load(file) is not first
+        assert explorer.cache_stats()["load"].evictions == 1
+
+    def test_accepts_custom_cache(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        caches = []
+
+        def create_cache():
+            caches.append({})
+            return caches[-1]
+
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), cache=create_cache)
+        result = explorer.search()
+
+        assert result in caches[1].values()
+        assert explorer.cache_stats() == {}
+
+    def test_bounded_validated_search_stays_correct(temp: TempDir):
+        temp.create_dir("a/b/c")
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), cache=2, validate_cache=True
+        )
+
+        assert explorer.search("a/b/c").config == {"a": "b"}
+        temp.create_file(".foorc.yaml", "a: changed")
+
+        assert explorer.search("a/b/c").config == {"a": "changed"}
+        assert explorer.search("a").config == {"a": "changed"}
+
+    def test_rejects_invalid_policy():
+        with pytest.raises(ValueError):
+            CachePolicy(max_entries=0)
+        with pytest.raises(ValueError):
+            CachePolicy(ttl=-1)
+
+
+def describe_validate_cache():
+    def test_load_rereads_changed_file(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), validate_cache=True)
+        file = str(temp.absolute_path(".foorc.yaml"))
+
+        with patch.object(builtins, "open", wraps=builtins.open) as open_spy:
+            assert explorer.load(file).config == {"a": "b"}
+            assert explorer.load(file).config == {"a": "b"}
+            temp.create_file(".foorc.yaml", "a: changed")
+            assert explorer.load(file).config == {"a": "changed"}
+
+            assert temp.get_spy_path_calls(open_spy) == [".foorc.yaml"] * 2
+
+    def test_search_notices_changed_file(temp: TempDir):
+        temp.create_dir("sub")
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), validate_cache=True)
+        start_dir = str(temp.absolute_path("sub"))
+
+        assert explorer.search(start_dir).config == {"a": "b"}
+        temp.create_file(".foorc.yaml", "a: changed")
+        assert explorer.search(start_dir).config == {"a": "changed"}
+
+    def test_search_notices_new_file(temp: TempDir):
+        temp.create_dir("sub")
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), validate_cache=True)
+        start_dir = str(temp.absolute_path("sub"))
+
+        assert explorer.search(start_dir).config == {"a": "b"}
+        temp.create_file("sub/.config/foorc.json", '{"a": "sub"}')
+        result = explorer.search(start_dir)
+
+        assert result.config == {"a": "sub"}
+        assert result.filepath == str(temp.absolute_path("sub/.config/foorc.json"))
+
+    def test_without_validation_serves_stale_result(temp: TempDir):
+        temp.create_dir("sub")
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+        start_dir = str(temp.absolute_path("sub"))
+
+        assert explorer.search(start_dir).config == {"a": "b"}
+        temp.create_file("sub/.foorc.yaml", "a: sub")
+        assert explorer.search(start_dir).config == {"a": "b"}
+
+
+def describe_search_cache():
+    def test_caches_unsuccessful_search(temp: TempDir):
+        temp.create_dir("a/b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+        start_dir = str(temp.absolute_path("a/b"))
+
+        assert explorer.search(start_dir) is None
+        with patch.object(os, "scandir", wraps=os.scandir) as scandir_spy:
+            assert explorer.search(start_dir) is None
+            assert explorer.search(str(temp.absolute_path("a"))) is None
+            assert explorer.search(str(temp.dir)) is None
+
+            assert scandir_spy.call_count == 0
+
+    def test_caches_transformed_unsuccessful_search(temp: TempDir):
+        calls = []
+
+        def transform(result):
+            calls.append(result)
+            return result
+
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), transform=transform)
+
+        assert explorer.search(str(temp.dir)) is None
+        assert explorer.search(str(temp.dir)) is None
+        assert calls == [None]
+
+    @pytest.mark.parametrize("validate_cache", [True, False])
+    def test_searches_deeper_than_recursion_limit(temp: TempDir, validate_cache: bool):
+        temp.create_file(".foorc.json", '{"a": "b"}')
+        deep_dir = "/".join(["d"] * 400)
+        temp.create_dir(deep_dir)
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), validate_cache=validate_cache
+        )
+
+        result = explorer.search(deep_dir)
+
+        assert result.config == {"a": "b"}
+        with patch.object(os, "scandir", wraps=os.scandir) as scandir_spy:
+            assert explorer.search("d/d") is result
+            assert scandir_spy.call_count == 0
+
+
+def describe_intern_configs():
+    def test_parses_same_content_once(temp: TempDir):
+        for name in ["a", "b", "c"]:
+            temp.create_file(f"{name}/.foorc.yaml", "a: b\nitems: [1, 2]")
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), intern_configs=True, instrument=True
+        )
+
+        results = [explorer.search(name) for name in ["a", "b", "c"]]
+
+        assert [result.filepath for result in results] == [
+            str(temp.absolute_path(f"{name}/.foorc.yaml")) for name in ["a", "b", "c"]
+        ]
+        assert all(result.config is results[0].config for result in results)
+        stats = explorer.stats()
+        assert stats.parses == {"load_yaml": 1}
+        assert stats.cache_hits["intern"] == 2
+
+    def test_parses_different_content_separately(temp: TempDir):
+        temp.create_file("a/.foorc.yaml", "a: b")
+        temp.create_file("b/.foorc.yaml", "a: c")
+        temp.create_file("c/.foorc.json", '{"a": "b"}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), intern_configs=True)
+
+        assert explorer.search("a").config == {"a": "b"}
+        assert explorer.search("b").config == {"a": "c"}
+        assert explorer.search("c").config == {"a": "b"}
+
+    def test_keeps_loaders_apart(temp: TempDir):
+        temp.create_file("a/.foorc.yaml", "a: b")
+        temp.create_file("b/.foorc", "a: b")
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            intern_configs=True,
+            loaders={"noExt": lambda filepath, content: {"raw": content}},
+        )
+
+        assert explorer.search("a").config == {"a": "b"}
+        assert explorer.search("b").config["raw"].strip() == "a: b"
+
+    def test_does_not_intern_python_configs(temp: TempDir):
+        for name in ["a", "b"]:
+            temp.create_file(f"{name}/.foorc.py", "config = {'a': 'b'}")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), intern_configs=True)
+
+        assert explorer.search("a").config is not explorer.search("b").config
+
+    def test_does_not_share_configs_by_default(temp: TempDir):
+        for name in ["a", "b"]:
+            temp.create_file(f"{name}/.foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        assert explorer.search("a").config is not explorer.search("b").config
+
+    def test_async_parses_same_content_once(temp: TempDir):
+        for name in ["a", "b"]:
+            temp.create_file(f"{name}/.foorc.json", '{"a": "b"}')
+        explorer = cosmiconfig_async("foo", stop_dir=str(temp.dir), intern_configs=True)
+
+        async def search_both():
+            return await explorer.search("a"), await explorer.search("b")
+
+        a, b = asyncio.run(search_both())
+
+        assert a.filepath != b.filepath
+        assert a.config is b.config
+
+
+def describe_thread_safe():
+    @pytest.fixture
+    def slow_loader():
+        calls = []
+        lock = threading.Lock()
+
+        def loader(filepath: str, content: str):
+            with lock:
+                calls.append(filepath)
+            time.sleep(0.05)
+            return load_yaml(filepath, content)
+
+        loader.calls = calls
+        return loader
+
+    def test_loads_file_once_for_concurrent_loads(temp: TempDir, slow_loader):
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            loaders={".yaml": slow_loader},
+            thread_safe=True,
+        )
+        file = str(temp.absolute_path(".foorc.yaml"))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: explorer.load(file), range(8)))
+
+        assert slow_loader.calls == [file]
+        assert all(result is results[0] for result in results)
+
+    @pytest.mark.parametrize("validate_cache", [True, False])
+    def test_searches_once_for_concurrent_searches(
+        temp: TempDir, slow_loader, validate_cache: bool
+    ):
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_dir("a/b")
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            loaders={".yaml": slow_loader},
+            thread_safe=True,
+            validate_cache=validate_cache,
+        )
+        start_dirs = ["a/b", "a", "."] * 4
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(explorer.search, start_dirs))
+
+        assert slow_loader.calls == [str(temp.absolute_path(".foorc.yaml"))]
+        assert all(result.config == {"a": "b"} for result in results)
+
+    def test_propagates_errors_to_waiting_threads(temp: TempDir):
+        temp.create_file(".foorc.json", "{ invalid")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), thread_safe=True)
+        file = str(temp.absolute_path(".foorc.json"))
+
+        def load(_):
+            with pytest.raises(ValueError, match="JSON Error"):
+                explorer.load(file)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(load, range(4)))
+
+
+def describe_pyproject_documents():
+    def test_parses_pyproject_once_for_all_explorers(temp: TempDir):
+        pyproject_documents.clear()
+        temp.create_file("pyproject.toml", "[tool.foo]\na = 1\n[tool.bar]\nb = 2")
+
+        backend = loaders.get_parser_backend("toml")
+        loads_spy = Mock(wraps=backend.loads)
+        with patch.dict(
+            loaders._parser_backends, {"toml": backend._replace(loads=loads_spy)}
+        ):
+            foo = cosmiconfig("foo", stop_dir=str(temp.dir)).search()
+            bar = cosmiconfig("bar", stop_dir=str(temp.dir)).search()
+
+            assert loads_spy.call_count == 1
+        assert foo.config == {"a": 1}
+        assert bar.config == {"b": 2}
+
+    def test_results_do_not_share_state(temp: TempDir):
+        temp.create_file("pyproject.toml", "[tool.foo]\na = 1")
+
+        first = cosmiconfig("foo", stop_dir=str(temp.dir)).search()
+        first.config["a"] = "changed"
+        second = cosmiconfig("foo", stop_dir=str(temp.dir)).search()
+
+        assert second.config == {"a": 1}
+
+    def test_skips_parsing_pyproject_without_tool_table(temp: TempDir):
+        pyproject_documents.clear()
+        temp.create_file("a/pyproject.toml", "[project]\nname = 'a'\n[tool.bar]\nb = 2")
+        temp.create_file("pyproject.toml", "[tool.foo]\na = 1")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), instrument=True)
+
+        result = explorer.search("a")
+
+        assert result.config == {"a": 1}
+        assert explorer.stats().parses == {"load_toml": 1}
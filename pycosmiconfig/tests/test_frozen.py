@@ -0,0 +1,193 @@
+import asyncio
+import copy
+import os
+import pickle
+import pytest
+
+from pycosmiconfig import (
+    FrozenDict,
+    FrozenList,
+    cosmiconfig,
+    cosmiconfig_async,
+    freeze,
+    thaw,
+)
+from pycosmiconfig.port.ExplorerBase import pyproject_documents
+from util import TempDir
+
+
+@pytest.fixture(autouse=True)
+def temp():
+    pyproject_documents.clear()
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+
+    current_dir = os.getcwd()
+    os.chdir(temp_dir.dir)
+    yield temp_dir
+    os.chdir(current_dir)
+    temp_dir.delete_temp_dir()
+
+
+def describe_freeze():
+    def test_converts_nested_values():
+        frozen = freeze({"a": [1, {"b": 2}], "c": {3}, "d": "e"})
+
+        assert isinstance(frozen, FrozenDict)
+        assert isinstance(frozen["a"], FrozenList)
+        assert isinstance(frozen["a"][1], FrozenDict)
+        assert frozen["c"] == frozenset([3])
+        assert frozen == {"a": [1, {"b": 2}], "c": {3}, "d": "e"}
+
+    def test_returns_frozen_values_as_they_are():
+        frozen = freeze({"a": [1, 2]})
+
+        assert freeze(frozen) is frozen
+        assert FrozenDict(b=frozen)["b"] is frozen
+
+    def test_rejects_changes():
+        frozen = freeze({"a": [1, 2]})
+
+        with pytest.raises(TypeError):
+            frozen["a"] = 1
+        with pytest.raises(TypeError):
+            frozen["a"][0] = 3
+        with pytest.raises(AttributeError):
+            frozen["a"].append(3)
+
+    def test_is_hashable():
+        assert hash(freeze({"a": [1, 2]})) == hash(freeze({"a": [1, 2]}))
+        assert len({freeze({"a": [1]}), freeze({"a": [1]}), freeze({"a": [2]})}) == 2
+
+    def test_copies_are_the_same_object():
+        frozen = freeze({"a": [1, 2]})
+
+        assert copy.copy(frozen) is frozen
+        assert copy.deepcopy(frozen) is frozen
+
+    def test_pickles():
+        frozen = freeze({"a": [1, {"b": 2}]})
+
+        unpickled = pickle.loads(pickle.dumps(frozen))
+
+        assert unpickled == frozen
+        assert isinstance(unpickled["a"][1], FrozenDict)
+
+    def test_slices_are_frozen():
+        frozen = freeze([1, 2, 3])
+
+        assert frozen[1:] == [2, 3]
+        assert isinstance(frozen[1:], FrozenList)
+
+
+def describe_thaw():
+    def test_returns_mutable_copy():
+        frozen = freeze({"a": [1, {"b": 2}]})
+
+        thawed = thaw(frozen)
+        thawed["a"][1]["b"] = 3
+
+        assert type(thawed) is dict
+        assert type(thawed["a"]) is list
+        assert thawed == {"a": [1, {"b": 3}]}
+        assert frozen == {"a": [1, {"b": 2}]}
+
+    def test_is_also_a_method():
+        assert freeze({"a": [1]}).thaw() == {"a": [1]}
+        assert type(freeze([1]).thaw()) is list
+
+    def test_returns_other_values_as_they_are():
+        value = object()
+
+        assert thaw(value) is value
+
+
+def describe_freeze_configs():
+    def test_search_returns_frozen_config(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b\nitems: [1, 2]")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), freeze_configs=True)
+
+        result = explorer.search()
+
+        assert isinstance(result.config, FrozenDict)
+        assert isinstance(result.config["items"], FrozenList)
+        assert result.config == {"a": "b", "items": [1, 2]}
+        assert explorer.search() is result
+
+    def test_load_returns_frozen_config(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": {"b": 1}}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), freeze_configs=True)
+
+        config = explorer.load(".foorc.json").config
+
+        assert isinstance(config["a"], FrozenDict)
+
+    def test_freezes_pyproject_property_only(temp: TempDir):
+        temp.create_file("pyproject.toml", "[tool.foo]\na = [1]\n[tool.bar]\nb = 2")
+        options = dict(stop_dir=str(temp.dir), use_meta_config=False)
+
+        foo = cosmiconfig("foo", freeze_configs=True, **options).search()
+        bar = cosmiconfig("bar", **options).search()
+
+        assert isinstance(foo.config, FrozenDict)
+        assert foo.config == {"a": [1]}
+        assert type(bar.config) is dict
+
+    def test_freezes_transformed_config(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": 1}')
+
+        def transform(result):
+            if result is None:
+                return None
+            return result.copy(update={"config": {**result.config, "b": [2]}})
+
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), freeze_configs=True, transform=transform
+        )
+
+        config = explorer.search().config
+
+        assert isinstance(config, FrozenDict)
+        assert isinstance(config["b"], FrozenList)
+        assert config == {"a": 1, "b": [2]}
+
+    def test_shares_interned_configs(temp: TempDir):
+        for name in ["a", "b"]:
+            temp.create_file(f"{name}/.foorc.yaml", "a: [1, 2]")
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), freeze_configs=True, intern_configs=True
+        )
+
+        a = explorer.search("a")
+        b = explorer.search("b")
+
+        assert isinstance(a.config, FrozenDict)
+        assert a.config is b.config
+
+    def test_freezes_merged_configs(temp: TempDir):
+        temp.create_file(".foorc.json", '{"shared": {"a": 1}, "b": 2}')
+        temp.create_file("pkg/.foorc.json", '{"b": 3}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), freeze_configs=True)
+
+        root = explorer.search_merged()
+        merged = explorer.search_merged("pkg")
+
+        assert isinstance(merged.config, FrozenDict)
+        assert merged.config == {"shared": {"a": 1}, "b": 3}
+        assert merged.config["shared"] is root.config["shared"]
+
+    def test_async_returns_frozen_config(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": [1]}')
+        explorer = cosmiconfig_async("foo", stop_dir=str(temp.dir), freeze_configs=True)
+
+        result = asyncio.run(explorer.search())
+
+        assert isinstance(result.config, FrozenDict)
+        assert result.config == {"a": [1]}
+
+    def test_configs_are_mutable_by_default(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": [1]}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        assert type(explorer.search().config) is dict
@@ -0,0 +1,98 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+from util import TempDir
+
+ROOT_DIR = Path(__file__).parent.parent.parent
+
+# Slow to import and not needed until used
+lazy_modules = [
+    "asyncio",
+    "concurrent.futures",
+    "ctypes",
+    "hashlib",
+    "tempfile",
+    "yaml",
+    "toml",
+    "tomli",
+    "tomllib",
+    "orjson",
+    "pycosmiconfig.port.AsyncExplorer",
+    "pycosmiconfig.persistent_cache",
+    "pycosmiconfig.watchers",
+    "pycosmiconfig.frozen",
+]
+
+
+@pytest.fixture(autouse=True)
+def temp():
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+    yield temp_dir
+    temp_dir.delete_temp_dir()
+
+
+def import_times(code: str, cwd: Path) -> Dict[str, int]:
+    """
+    Runs `code` in a new interpreter with `python -X importtime`. Returns
+    the cumulative import time (in microseconds) of each imported module.
+    """
+    env = {**os.environ, "PYTHONPATH": str(ROOT_DIR)}
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(cwd),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.partition(":")[2].split("|")
+        times[module.strip()] = int(cumulative)
+    return times
+
+
+def describe_import_time():
+    def test_import_does_not_load_lazy_modules(temp: TempDir):
+        times = import_times("import pycosmiconfig", temp.dir)
+
+        assert "pycosmiconfig" in times
+        loaded = [module for module in lazy_modules if module in times]
+        assert loaded == [], (
+            f"import pycosmiconfig took {times['pycosmiconfig']}us and "
+            f"loaded {loaded}"
+        )
+
+    def test_loaders_import_only_their_parser(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": 1}')
+        code = (
+            "from pycosmiconfig import cosmiconfig\n"
+            f"assert cosmiconfig('foo', stop_dir={str(temp.dir)!r}).search()\n"
+        )
+
+        times = import_times(code, temp.dir)
+
+        # concurrent.futures is only needed by `search_many()`
+        for module in ["yaml", "toml", "tomli", "tomllib", "concurrent.futures"]:
+            assert module not in times
+
+    def test_toml_loader_imports_one_parser(temp: TempDir):
+        temp.create_file("pyproject.toml", "[tool.foo]\na = 1")
+        code = (
+            "from pycosmiconfig import cosmiconfig\n"
+            f"assert cosmiconfig('foo', stop_dir={str(temp.dir)!r}).search()\n"
+        )
+
+        times = import_times(code, temp.dir)
+
+        loaded = [module for module in ["tomllib", "tomli", "toml"] if module in times]
+        assert len(loaded) == 1, loaded
@@ -0,0 +1,103 @@
+import os
+import pytest
+from typing import List
+
+from pycosmiconfig import ExplorerEvent, cosmiconfig, cosmiconfig_async
+from pycosmiconfig.port.ExplorerBase import pyproject_documents
+from util import TempDir
+
+
+@pytest.fixture(autouse=True)
+def temp():
+    pyproject_documents.clear()
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+
+    current_dir = os.getcwd()
+    os.chdir(temp_dir.dir)
+    yield temp_dir
+    os.chdir(current_dir)
+    temp_dir.delete_temp_dir()
+
+
+def describe_instrument():
+    def test_stats_are_none_when_disabled(temp: TempDir):
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        assert explorer._instrumentation is None
+        assert explorer.stats() is None
+
+    def test_emits_search_events(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_dir("a/b")
+        events: List[ExplorerEvent] = []
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), instrument=events.append)
+
+        explorer.search("a/b")
+
+        assert [(event.kind, event.path) for event in events] == [
+            ("dir_visited", str(temp.absolute_path("a/b"))),
+            ("dir_visited", str(temp.absolute_path("a"))),
+            ("dir_visited", str(temp.absolute_path("."))),
+            ("file_probed", str(temp.absolute_path(".foorc.yaml"))),
+            ("file_read", str(temp.absolute_path(".foorc.yaml"))),
+            ("parse", str(temp.absolute_path(".foorc.yaml"))),
+            ("transform", str(temp.absolute_path(".foorc.yaml"))),
+            ("cache_miss", str(temp.absolute_path("."))),
+            ("cache_miss", str(temp.absolute_path("a"))),
+            ("cache_miss", str(temp.absolute_path("a/b"))),
+        ]
+        parse = events[5]
+        assert parse.loader == "load_yaml"
+        assert parse.duration is not None and parse.duration >= 0
+        assert events[-1].cache == "search"
+
+    def test_aggregates_stats(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": "b"}')
+        temp.create_file("a/pyproject.toml", '[tool.foo]\na = "c"')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), instrument=True)
+
+        explorer.search("a")
+        explorer.search("a")
+        explorer.load(".foorc.json")
+        explorer.load(".foorc.json")
+
+        stats = explorer.stats()
+        assert stats.dirs_visited == 1
+        assert stats.files_probed == 1
+        assert stats.files_read == 2
+        assert stats.parses == {"load_toml": 1, "load_json": 1}
+        assert set(stats.parse_time) == {"load_toml", "load_json"}
+        assert stats.transforms == 2
+        assert stats.cache_hits == {"search": 1, "load": 1}
+        assert stats.cache_misses == {"search": 1, "load": 1}
+
+    def test_does_not_count_shared_pyproject_as_parse(temp: TempDir):
+        temp.create_file("pyproject.toml", '[tool.foo]\na = "b"\n[tool.bar]\na = "c"')
+        options = dict(stop_dir=str(temp.dir), use_meta_config=False)
+        cosmiconfig("foo", **options).search()
+        explorer = cosmiconfig("bar", instrument=True, **options)
+
+        assert explorer.search().config == {"a": "c"}
+        stats = explorer.stats()
+        assert stats.files_read == 1
+        assert stats.parses == {}
+
+    def test_counts_searches_without_cache(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": "b"}')
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), cache=False, instrument=True
+        )
+
+        explorer.search()
+        explorer.search()
+
+        stats = explorer.stats()
+        assert stats.files_read == 2
+        assert stats.cache_hits == {}
+        assert stats.cache_misses == {}
+
+    def test_rejects_async_explorer():
+        with pytest.raises(ValueError, match="instrument"):
+            cosmiconfig_async("foo", instrument=True)
@@ -0,0 +1,193 @@
+import builtins
+import importlib
+import importlib.util
+import os
+import sys
+import pytest
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from pycosmiconfig import (
+    get_available_parser_backends,
+    get_parser_backend,
+    load_json,
+    load_py,
+    load_toml,
+    load_yaml,
+    set_parser_backend,
+)
+from pycosmiconfig.port import loaders
+
+# Every available backend must parse these the same as the reference backend
+# (the last one listed for the format), and reject the same invalid documents.
+documents = {
+    "toml": [
+        'a = 1\nb = "two"\nc = [1, 2, 3]\nd = true\ne = 1.5',
+        "[tool.foo]\nbar = { baz = 'qux' }\n[[tool.foo.items]]\nx = 1",
+        "# comment only",
+        'multiline = """\nfoo\nbar"""\nliteral = \'C:\\\\path\'',
+        'unicode = "\\u00e9"\nnested.dotted.key = 0x10',
+        # Equal datetimes, but of different tzinfo types, see below
+        "offset = 1979-05-27T07:32:00-08:00\nutc = 1979-05-27T07:32:00Z",
+        "local = 1979-05-27T07:32:00\ndate = 1979-05-27\ntime = 07:32:00",
+    ],
+    "yaml": [
+        "a: 1\nb: two\nc: [1, 2, 3]\nd: true\ne: 1.5\nf: null",
+        "nested:\n  list:\n    - x: 1\n    - y: 2\n  str: 'quoted'",
+        "anchor: &a {k: v}\nalias: *a",
+        "date: 2001-12-14\nmulti: |\n  foo\n  bar",
+        "",
+    ],
+    "json": [
+        '{"a": 1, "b": "two", "c": [1, 2, 3], "d": true, "e": 1.5, "f": null}',
+        '{"nested": {"list": [{"x": 1}, {"y": "\\u00e9"}]}}',
+        '{"nan": NaN, "inf": Infinity}',
+        '{"big": 123456789012345678901234567890}',
+        "[]",
+    ],
+}
+
+invalid_documents = {
+    "toml": ["a = ", "[foo\nbar = 1", "a = 1\na = 2"],
+    "yaml": ["a: [1, 2", "a: b: c", "- a\nb: c"],
+    "json": ["{ invalid", '{"a": 1,}', "[1, 2"],
+}
+
+load_fns = {"toml": load_toml, "yaml": load_yaml, "json": load_json}
+
+
+@pytest.fixture(autouse=True)
+def restore_parser_backends():
+    backends = dict(loaders._parser_backends)
+    yield
+    loaders._parser_backends.clear()
+    loaders._parser_backends.update(backends)
+
+
+def equal(a, b) -> bool:
+    # NaN is not equal to itself
+    return a == b or repr(a) == repr(b)
+
+
+def describe_parser_backends():
+    @pytest.mark.parametrize("file_format", list(documents))
+    def test_reference_backend_is_available(file_format: str):
+        reference_name, _ = loaders.parser_backend_factories[file_format][-1]
+
+        assert get_available_parser_backends(file_format)[-1].name == reference_name
+
+    @pytest.mark.parametrize("file_format", list(documents))
+    def test_uses_preferred_available_backend(file_format: str):
+        loaders._parser_backends.clear()
+
+        expected = get_available_parser_backends(file_format)[0]
+        assert get_parser_backend(file_format).name == expected.name
+
+    @pytest.mark.parametrize("file_format", list(documents))
+    def test_backends_give_same_results(file_format: str):
+        *backends, reference = get_available_parser_backends(file_format)
+
+        for document in documents[file_format]:
+            expected = reference.loads(document)
+            for backend in backends:
+                assert equal(backend.loads(document), expected), backend.name
+
+    @pytest.mark.parametrize("file_format", list(documents))
+    def test_backends_reject_same_documents(file_format: str):
+        for backend in get_available_parser_backends(file_format):
+            set_parser_backend(file_format, backend.name)
+            for document in invalid_documents[file_format]:
+                with pytest.raises(ValueError, match=f"{file_format.upper()} Error"):
+                    load_fns[file_format]("/foo/.foorc", document)
+
+    # Known differences, documented in the README ("Parser backends")
+
+    def test_only_toml_rejects_mixed_type_arrays():
+        for backend in get_available_parser_backends("toml"):
+            set_parser_backend("toml", backend.name)
+            if backend.name == "toml":
+                with pytest.raises(ValueError, match="TOML Error"):
+                    load_toml("/foo/.foorc.toml", 'a = [1, "x"]')
+            else:
+                assert load_toml("/foo/.foorc.toml", 'a = [1, "x"]') == {"a": [1, "x"]}
+
+    def test_toml_backends_differ_in_offset_datetime_tzinfo():
+        expected = datetime(1979, 5, 27, 7, 32, tzinfo=timezone(timedelta(hours=-8)))
+
+        for backend in get_available_parser_backends("toml"):
+            value = backend.loads("d = 1979-05-27T07:32:00-08:00")["d"]
+
+            assert value == expected
+            assert value.utcoffset() == timedelta(hours=-8)
+            if backend.name == "toml":
+                assert type(value.tzinfo).__name__ == "TomlTz"
+            else:
+                assert type(value.tzinfo) is timezone
+
+    def test_set_parser_backend_rejects_unknown_backend():
+        with pytest.raises(ValueError, match="Unknown toml parser backend"):
+            set_parser_backend("toml", "foo")
+
+    def test_set_parser_backend_changes_loader_backend():
+        set_parser_backend("json", "json")
+
+        assert get_parser_backend("json").name == "json"
+        assert load_json("/foo/.foorc.json", '{"a": 1}') == {"a": 1}
+
+
+def describe_load_py():
+    @pytest.fixture(autouse=True)
+    def write_bytecode(monkeypatch):
+        monkeypatch.setattr(sys, "dont_write_bytecode", False)
+
+    @pytest.fixture
+    def config_file(tmp_path):
+        file = tmp_path / ".foorc.py"
+        file.write_text("config = {'a': 'file'}")
+        return str(file)
+
+    @pytest.fixture
+    def compile_spy():
+        with patch.object(builtins, "compile", wraps=builtins.compile) as spy:
+            yield spy
+
+    def test_runs_given_content(config_file: str):
+        config = load_py(config_file, "config = {'a': 'content', 'file': __file__}")
+
+        assert config == {"a": "content", "file": config_file}
+
+    def test_does_not_import_by_path(config_file: str):
+        with patch.object(importlib, "import_module") as import_spy:
+            load_py(config_file, "config = {}")
+
+            assert import_spy.call_count == 0
+
+    def test_reuses_compiled_code(config_file: str, compile_spy):
+        content = "config = {'a': 'b'}"
+
+        assert load_py(config_file, content) == {"a": "b"}
+        assert load_py(config_file, content) == {"a": "b"}
+        assert compile_spy.call_count == 1
+        assert os.path.exists(importlib.util.cache_from_source(config_file))
+
+    def test_recompiles_changed_content(config_file: str, compile_spy):
+        load_py(config_file, "config = {'a': 'b'}")
+
+        assert load_py(config_file, "config = {'a': 'c'}") == {"a": "c"}
+        assert compile_spy.call_count == 2
+
+    def test_ignores_corrupted_cached_code(config_file: str, compile_spy):
+        content = "config = {'a': 'b'}"
+        load_py(config_file, content)
+        cache_path = importlib.util.cache_from_source(config_file)
+        with open(cache_path, "r+b") as f:
+            f.truncate(20)
+
+        assert load_py(config_file, content) == {"a": "b"}
+        assert compile_spy.call_count == 2
+
+    def test_respects_dont_write_bytecode(config_file: str, monkeypatch):
+        monkeypatch.setattr(sys, "dont_write_bytecode", True)
+
+        assert load_py(config_file, "config = {'a': 'b'}") == {"a": "b"}
+        assert not os.path.exists(importlib.util.cache_from_source(config_file))
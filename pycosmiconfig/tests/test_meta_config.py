@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import patch
 
 from pycosmiconfig import cosmiconfig, Options, CosmiconfigResult
+from pycosmiconfig.port.index import _META_EXPLORERS_MAX_ENTRIES, _meta_explorers
 from util import TempDir
 
 
@@ -47,24 +48,13 @@ def describe_uses_user_configured_search_places_without_placeholders():
             # Check read files as cosmiconfig searches for meta config
             explorer = cosmiconfig("foo", **explorer_options.dict())
             meta_config_search_paths = temp.get_spy_path_calls(open_spy)
-            assert meta_config_search_paths == [
-                "pyproject.toml",
-                "pyproject.tml",
-                ".config.json",
-                ".config.yaml",
-                ".config.yml",
-            ]
+            assert meta_config_search_paths == [".config.yml"]
             open_spy.reset_mock()
 
             # Check read files as cosmiconfig searches for package config
             result = explorer.search(start_dir)
             config_search_paths = temp.get_spy_path_calls(open_spy)
-            assert config_search_paths == [
-                ".config.yml",
-                "sub/.foo-config",
-                "sub/.foo.config.yml",
-                ".foo-config",
-            ]
+            assert config_search_paths == [".config.yml", ".foo-config"]
             assert result == CosmiconfigResult(config={"a": "c"}, filepath=str(file))
 
     def test_without_placeholder(temp: TempDir):
@@ -108,13 +98,7 @@ def describe_checks_config_in_meta_file():
                 explorer = cosmiconfig("foo", **explorer_options.dict())
                 meta_config_search_paths = temp.get_spy_path_calls(open_spy)
 
-                assert meta_config_search_paths == [
-                    "pyproject.toml",
-                    "pyproject.tml",
-                    ".config.json",
-                    ".config.yaml",
-                    ".config.yml",
-                ]
+                assert meta_config_search_paths == [".config.yml"]
                 open_spy.reset_mock()
 
                 # Check read files as cosmiconfig searches for package config
@@ -144,3 +128,61 @@ def describe_checks_config_in_meta_file():
                 assert result == CosmiconfigResult(
                     config={"a": "d"}, filepath=str(temp.absolute_path(".config.yml"))
                 )
+
+
+def describe_memoizes_meta_config():
+    @pytest.fixture(autouse=True)
+    def current_dir(temp: TempDir):
+        temp.create_file(".foo-config", "a: c")
+        temp.create_file(
+            ".config.yml", 'pycosmiconfig:\n  search_places: [".foo-config"]'
+        )
+
+        current_dir = os.getcwd()
+        os.chdir(temp.dir)
+        yield current_dir
+        os.chdir(current_dir)
+
+    def test_meta_config_resolved_once_per_cwd(temp: TempDir):
+        cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        with patch.object(builtins, "open", wraps=builtins.open) as open_spy:
+            explorer = cosmiconfig("bar", stop_dir=str(temp.dir))
+            assert temp.get_spy_path_calls(open_spy) == []
+
+            result = explorer.search()
+            explorer.search()
+            assert temp.get_spy_path_calls(open_spy) == [".config.yml", ".foo-config"]
+            assert result.config == {"a": "c"}
+
+    def test_meta_config_change_is_picked_up(temp: TempDir):
+        cosmiconfig("foo", stop_dir=str(temp.dir))
+        temp.create_file(
+            ".config.yml", 'pycosmiconfig:\n  search_places: [".foo-config2"]'
+        )
+        temp.create_file(".foo-config2", "a: d")
+
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        assert explorer.search().config == {"a": "d"}
+
+    def test_meta_config_can_be_disabled(temp: TempDir):
+        temp.create_file(".foorc", "a: rc")
+
+        with patch.object(builtins, "open", wraps=builtins.open) as open_spy:
+            explorer = cosmiconfig("foo", stop_dir=str(temp.dir), use_meta_config=False)
+            result = explorer.search()
+
+            assert temp.get_spy_path_calls(open_spy) == [".foorc"]
+            assert result.config == {"a": "rc"}
+
+    def test_meta_explorers_are_bounded(temp: TempDir):
+        for index in range(_META_EXPLORERS_MAX_ENTRIES + 1):
+            temp.create_dir(f"dir{index}")
+            os.chdir(temp.absolute_path(f"dir{index}"))
+            cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        assert len(_meta_explorers) == _META_EXPLORERS_MAX_ENTRIES
+        for cwd in list(_meta_explorers):
+            search_cache = _meta_explorers.get(cwd)._search_cache
+            assert search_cache.max_entries == _META_EXPLORERS_MAX_ENTRIES
@@ -0,0 +1,253 @@
+import os
+import pytest
+import time
+import toml
+from unittest.mock import patch
+
+from pycosmiconfig import (
+    cosmiconfig,
+    get_available_parser_backends,
+    get_parser_backend,
+    load_toml,
+    load_yaml,
+    set_parser_backend,
+)
+from pycosmiconfig.persistent_cache import MISSING, PersistentCache
+from pycosmiconfig.port import loaders
+from pycosmiconfig.port.ExplorerBase import pyproject_documents
+from util import TempDir
+
+loader_calls = []
+
+
+def counting_loader(filepath: str, content: str):
+    loader_calls.append(filepath)
+    return load_yaml(filepath, content)
+
+
+def picking_loader(filepath: str, content: str):
+    return load_yaml(filepath, content)["a"]
+
+
+@pytest.fixture(autouse=True)
+def temp():
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+    loader_calls.clear()
+    # Parsed pyproject.toml would otherwise be reused from memory
+    pyproject_documents.clear()
+
+    current_dir = os.getcwd()
+    os.chdir(temp_dir.dir)
+    yield temp_dir
+    os.chdir(current_dir)
+    temp_dir.delete_temp_dir()
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def create_explorer(temp: TempDir, cache_dir):
+    def create_explorer(**options):
+        return cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            persistent_cache=True,
+            persistent_cache_dir=str(cache_dir),
+            **options,
+        )
+
+    return create_explorer
+
+
+def describe_persistent_cache():
+    def test_reuses_parsed_config_across_explorers(temp: TempDir, create_explorer):
+        temp.create_file(".foorc.yaml", "a: b")
+        options = {"loaders": {".yaml": counting_loader}}
+
+        first = create_explorer(**options).search()
+        second = create_explorer(**options).search()
+
+        assert first == second
+        assert second.config == {"a": "b"}
+        assert loader_calls == [str(temp.absolute_path(".foorc.yaml"))]
+
+    def test_reparses_changed_config(temp: TempDir, create_explorer):
+        temp.create_file(".foorc.yaml", "a: b")
+        options = {"loaders": {".yaml": counting_loader}}
+
+        create_explorer(**options).search()
+        temp.create_file(".foorc.yaml", "a: changed")
+        result = create_explorer(**options).search()
+
+        assert result.config == {"a": "changed"}
+        assert len(loader_calls) == 2
+
+    def test_caches_pyproject(temp: TempDir, create_explorer, cache_dir):
+        temp.create_file("pyproject.toml", "[tool.foo]\na = 1")
+
+        create_explorer().search()
+        pyproject_documents.clear()
+        with patch.object(toml, "loads", wraps=toml.loads) as loads_spy:
+            result = create_explorer().search()
+
+            assert loads_spy.call_count == 0
+        assert result.config == {"a": 1}
+        assert len(list(cache_dir.glob("*.pickle"))) == 1
+
+    def test_does_not_cache_py_configs(temp: TempDir, create_explorer, cache_dir):
+        temp.create_file(".foorc.py", "config = {'a': 'b'}")
+
+        result = create_explorer().search()
+
+        assert result.config == {"a": "b"}
+        assert not cache_dir.exists()
+
+    def test_does_not_cache_anonymous_loaders(
+        temp: TempDir, create_explorer, cache_dir
+    ):
+        temp.create_file(".foorc.yaml", "a: b")
+
+        result = create_explorer(
+            loaders={".yaml": lambda path, content: load_yaml(path, content)}
+        ).search()
+
+        assert result.config == {"a": "b"}
+        assert not cache_dir.exists()
+
+    def test_reparses_when_loader_constant_changes(temp: TempDir, create_explorer):
+        temp.create_file(".foorc.yaml", "a: 1\nb: 2")
+        options = {"loaders": {".yaml": picking_loader}}
+        code = picking_loader.__code__
+
+        first = create_explorer(**options).search()
+        try:
+            # Same as editing `["a"]` to `["b"]` in the loader's source
+            picking_loader.__code__ = code.replace(
+                co_consts=tuple("b" if c == "a" else c for c in code.co_consts)
+            )
+            second = create_explorer(**options).search()
+        finally:
+            picking_loader.__code__ = code
+
+        assert first.config == 1
+        assert second.config == 2
+
+    def test_ignores_corrupted_entries(temp: TempDir, create_explorer, cache_dir):
+        temp.create_file(".foorc.yaml", "a: b")
+        options = {"loaders": {".yaml": counting_loader}}
+        create_explorer(**options).search()
+
+        for entry in cache_dir.iterdir():
+            entry.write_bytes(b"not a pickle")
+        result = create_explorer(**options).search()
+
+        assert result.config == {"a": "b"}
+        assert len(loader_calls) == 2
+
+
+def describe_make_key():
+    def test_depends_on_parser_backend(cache_dir):
+        backends = get_available_parser_backends("toml")
+        if len(backends) < 2:
+            pytest.skip("needs two toml parser backends")
+        cache = PersistentCache(cache_dir)
+        previous = get_parser_backend("toml").name
+        try:
+            set_parser_backend("toml", backends[0].name)
+            first = cache.make_key(load_toml, "pyproject.toml", "a = 1")
+            set_parser_backend("toml", backends[1].name)
+            second = cache.make_key(load_toml, "pyproject.toml", "a = 1")
+        finally:
+            set_parser_backend("toml", previous)
+
+        assert first != second
+
+    def test_depends_on_parser_backend_version(cache_dir):
+        cache = PersistentCache(cache_dir)
+        backend = get_parser_backend("toml")
+
+        key = cache.make_key(load_toml, "pyproject.toml", "a = 1")
+        with patch.dict(
+            loaders._parser_backends, {"toml": backend._replace(version="0.0.0")}
+        ):
+            changed_key = cache.make_key(load_toml, "pyproject.toml", "a = 1")
+
+        assert key != changed_key
+
+    def test_depends_on_loader_code(cache_dir):
+        cache = PersistentCache(cache_dir)
+
+        def other_loader(filepath: str, content: str):
+            return None
+
+        key = cache.make_key(counting_loader, ".foorc.yaml", "a: b")
+        code = counting_loader.__code__
+        try:
+            counting_loader.__code__ = other_loader.__code__
+            changed_key = cache.make_key(counting_loader, ".foorc.yaml", "a: b")
+        finally:
+            counting_loader.__code__ = code
+
+        assert key != changed_key
+        assert cache.make_key(counting_loader, ".foorc.yaml", "a: b") == key
+
+
+def _set_entries(cache: PersistentCache, count: int):
+    now = time.time()
+    for index in range(count):
+        cache.set(f"key{index}", index)
+        # Older entries were used longer ago
+        mtime = now - (count - index) * 60
+        os.utime(cache._entry_path(f"key{index}"), (mtime, mtime))
+
+
+def describe_prune():
+    def test_removes_least_recently_used_entries(cache_dir):
+        cache = PersistentCache(cache_dir, max_entries=2)
+        _set_entries(cache, 3)
+
+        cache.prune()
+
+        assert cache.get("key0") is MISSING
+        assert cache.get("key1") == 1
+        assert cache.get("key2") == 2
+
+    def test_removes_entries_older_than_max_age(cache_dir):
+        cache = PersistentCache(cache_dir, max_age=90)
+        _set_entries(cache, 3)
+
+        cache.prune()
+
+        assert cache.get("key0") is MISSING
+        assert cache.get("key1") is MISSING
+        assert cache.get("key2") == 2
+
+    def test_prunes_on_set_once_per_interval(cache_dir):
+        cache = PersistentCache(cache_dir, max_entries=1)
+        _set_entries(cache, 2)
+
+        # Pruned only when the first entry was set
+        assert cache.get("key0") == 0
+        mtime = time.time() - 24 * 60 * 60 - 60
+        os.utime(cache_dir / "last-prune", (mtime, mtime))
+        cache.set("key2", 2)
+
+        assert cache.get("key0") is MISSING
+        assert cache.get("key1") is MISSING
+        assert cache.get("key2") == 2
+
+    def test_keeps_used_entries(cache_dir):
+        cache = PersistentCache(cache_dir, max_age=24 * 60 * 60 + 60)
+        cache.set("key", 1)
+        mtime = time.time() - 24 * 60 * 60 - 30
+        os.utime(cache._entry_path("key"), (mtime, mtime))
+
+        assert cache.get("key") == 1
+        cache.prune()
+
+        assert cache.get("key") == 1
@@ -0,0 +1,430 @@
+import asyncio
+import builtins
+import os
+import pytest
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from pycosmiconfig import cosmiconfig, cosmiconfig_async, CosmiconfigResult
+from util import TempDir
+
+
+@pytest.fixture(autouse=True)
+def temp():
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+
+    current_dir = os.getcwd()
+    os.chdir(temp_dir.dir)
+    yield temp_dir
+    os.chdir(current_dir)
+    temp_dir.delete_temp_dir()
+
+
+def describe_directory_listing():
+    def test_opens_only_existing_search_places(temp: TempDir):
+        temp.create_dir("a/b")
+        temp.create_file("a/.config/foorc.yaml", "found: true")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        with patch.object(builtins, "open", wraps=builtins.open) as open_spy:
+            result = explorer.search(str(temp.absolute_path("a/b")))
+
+            assert temp.get_spy_path_calls(open_spy) == ["a/.config/foorc.yaml"]
+            assert result == CosmiconfigResult(
+                config={"found": True},
+                filepath=str(temp.absolute_path("a/.config/foorc.yaml")),
+            )
+
+    def test_lists_each_directory_once(temp: TempDir):
+        temp.create_dir("a/b")
+        temp.create_dir("a/.config")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        with patch.object(os, "scandir", wraps=os.scandir) as scandir_spy:
+            result = explorer.search(str(temp.absolute_path("a/b")))
+
+            assert temp.get_spy_path_calls(scandir_spy) == [
+                "a/b",
+                "a",
+                "a/.config",
+                ".",
+            ]
+            assert result is None
+
+    def test_skips_directories_and_empty_files(temp: TempDir):
+        temp.create_dir(".foorc")
+        temp.create_file(".foorc.json", "")
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        result = explorer.search(str(temp.dir))
+
+        assert result == CosmiconfigResult(
+            config={"a": "b"}, filepath=str(temp.absolute_path(".foorc.yaml"))
+        )
+
+    def test_respects_search_places_order(temp: TempDir):
+        temp.create_file(".config/foorc.json", '{"a": "config"}')
+        temp.create_file(".foorc.py", "config = {'a': 'py'}")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        result = explorer.search(str(temp.dir))
+
+        assert result.config == {"a": "py"}
+
+    def test_finds_other_case_on_case_insensitive_filesystem(temp: TempDir):
+        temp.create_file(".config/FOORC.JSON", '{"a": "b"}')
+        real_open = builtins.open
+
+        # Opens files the way case-insensitive filesystems do
+        def open_case_insensitive(file, *args, **kwargs):
+            path = Path(file)
+            if not path.exists() and path.parent.is_dir():
+                for name in os.listdir(path.parent):
+                    if name.casefold() == path.name.casefold():
+                        file = str(path.parent / name)
+            return real_open(file, *args, **kwargs)
+
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+        with patch.object(builtins, "open", side_effect=open_case_insensitive):
+            result = explorer.search(str(temp.dir))
+
+        assert result == CosmiconfigResult(
+            config={"a": "b"}, filepath=str(temp.absolute_path(".config/foorc.json"))
+        )
+
+    def test_skips_other_case_on_case_sensitive_filesystem(temp: TempDir):
+        temp.create_file(".FOORC.json", '{"a": "b"}')
+        if temp.absolute_path(".foorc.json").exists():
+            pytest.skip("filesystem is case-insensitive")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        assert explorer.search(str(temp.dir)) is None
+
+
+def describe_search_plan():
+    def test_compiles_search_places(temp: TempDir):
+        def load_custom(filepath, content):
+            return {"custom": content}
+
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            search_places=["pyproject.toml", ".config/foorc.custom", "../foorc.json"],
+            loaders={".custom": load_custom},
+        )
+
+        pyproject, custom, outside = explorer._search_plan
+        assert pyproject.is_pyproject
+        assert pyproject.lookups == (("", "pyproject.toml"),)
+        assert custom.loader is load_custom
+        assert not custom.is_pyproject
+        assert custom.lookups == (("", ".config"), (".config", "foorc.custom"))
+        assert outside.lookups is None
+
+    def test_finds_places_outside_searched_directory(temp: TempDir):
+        temp.create_file("shared/foorc.json", '{"a": "shared"}')
+        temp.create_dir("project")
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            search_places=["../shared/foorc.json"],
+        )
+
+        result = explorer.search("project")
+
+        assert result.config == {"a": "shared"}
+
+    def test_load_resolves_loader_by_extension(temp: TempDir):
+        temp.create_file("other.custom", "x")
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            loaders={".custom": lambda filepath, content: {"custom": content.strip()}},
+        )
+
+        assert explorer.load("other.custom").config == {"custom": "x"}
+
+
+def describe_path_resolution():
+    @pytest.fixture
+    def linked(temp: TempDir):
+        # `project/link` points to `real/dir`, each side has its own config
+        temp.create_file("real/.foorc.json", '{"a": "real"}')
+        temp.create_dir("real/dir")
+        temp.create_file("project/.foorc.json", '{"a": "project"}')
+        os.symlink(temp.absolute_path("real/dir"), temp.absolute_path("project/link"))
+        return str(temp.absolute_path("project/link"))
+
+    def test_searches_from_real_path(temp: TempDir, linked: str):
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        result = explorer.search(linked)
+
+        assert result.config == {"a": "real"}
+        assert result.filepath == str(temp.dir.resolve() / "real/.foorc.json")
+
+    def test_preserves_symlinks(temp: TempDir, linked: str):
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), preserve_symlinks=True)
+
+        result = explorer.search(os.path.join(linked, "..", "link"))
+
+        assert result.config == {"a": "project"}
+        assert result.filepath == str(temp.absolute_path("project/.foorc.json"))
+
+    def test_skips_resolving_cached_real_paths(temp: TempDir):
+        temp.create_file("a/.foorc.json", '{"a": "b"}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), validate_cache=True)
+        directory = str(temp.absolute_path("a").resolve())
+        file = os.path.join(directory, ".foorc.json")
+        search_result = explorer.search(directory)
+        load_result = explorer.load(file)
+
+        with patch.object(os.path, "realpath", wraps=os.path.realpath) as spy:
+            assert explorer.search(directory) is search_result
+            assert explorer.load(file) is load_result
+            assert spy.call_count == 0
+
+            assert explorer.load(os.path.join(directory, "..", "a/.foorc.json")) is (
+                load_result
+            )
+            assert spy.call_count == 1
+
+    def test_async_skips_resolving_cached_real_paths(temp: TempDir):
+        temp.create_file("a/.foorc.json", '{"a": "b"}')
+        explorer = cosmiconfig_async("foo", stop_dir=str(temp.dir), validate_cache=True)
+        directory = str(temp.absolute_path("a").resolve())
+        file = os.path.join(directory, ".foorc.json")
+
+        async def search_and_load():
+            return await explorer.search(directory), await explorer.load(file)
+
+        search_result, load_result = asyncio.run(search_and_load())
+
+        with patch.object(os.path, "realpath", wraps=os.path.realpath) as spy:
+            assert asyncio.run(search_and_load()) == (search_result, load_result)
+            assert spy.call_count == 0
+
+    def test_resolves_relative_stop_dir_per_search(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": "root"}')
+        temp.create_dir("a/b")
+        explorer = cosmiconfig("foo", stop_dir=".", cache=False)
+
+        os.chdir(temp.absolute_path("a"))
+        assert explorer.search("b") is None
+        os.chdir(temp.dir)
+        assert explorer.search("a/b").config == {"a": "root"}
+
+
+def describe_search_many():
+    @pytest.fixture
+    def tree(temp: TempDir):
+        temp.create_file("pkg-a/.foorc.yaml", "pkg: a")
+        temp.create_dir("pkg-a/src/deep")
+        temp.create_dir("pkg-b/src")
+        temp.create_dir("pkg-c")
+        temp.create_file(".config/foorc.json", '{"pkg": "root"}')
+        return [
+            str(temp.absolute_path("pkg-a/src/deep")),
+            str(temp.absolute_path("pkg-a/src")),
+            str(temp.absolute_path("pkg-b/src")),
+            str(temp.absolute_path("pkg-c")),
+            str(temp.absolute_path("pkg-c")),
+            "pkg-c",
+        ]
+
+    @pytest.mark.parametrize("cache", [True, False])
+    def test_same_results_as_search(temp: TempDir, tree, cache: bool):
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), cache=cache)
+        expected = {from_dir: explorer.search(from_dir) for from_dir in tree}
+
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), cache=cache)
+        results = explorer.search_many(tree)
+
+        assert results == expected
+        assert results["pkg-c"].config == {"pkg": "root"}
+        assert results[tree[0]].config == {"pkg": "a"}
+
+    def test_lists_each_directory_once(temp: TempDir, tree):
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), cache=False)
+
+        with patch.object(os, "scandir", wraps=os.scandir) as scandir_spy:
+            explorer.search_many(tree)
+
+            listed = temp.get_spy_path_calls(scandir_spy)
+            assert sorted(listed) == sorted(set(listed))
+
+    @pytest.mark.parametrize("validate_cache", [True, False])
+    def test_same_results_with_thread_pool(temp: TempDir, tree, validate_cache: bool):
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+        expected = explorer.search_many(tree)
+
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), validate_cache=validate_cache
+        )
+        results = explorer.search_many(tree, max_workers=4)
+
+        assert results == expected
+        assert explorer.search_many(tree, max_workers=4) == expected
+
+    def test_thread_pool_reads_only_files_search_reads(temp: TempDir):
+        temp.create_file(".foorc.json", "{ invalid")
+        temp.create_file("pkg/.foorc.yaml", "a: b")
+        temp.create_dir("pkg/src")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        results = explorer.search_many(["pkg/src", "pkg"], max_workers=4)
+        assert results["pkg/src"].config == {"a": "b"}
+
+        with pytest.raises(ValueError, match="JSON Error"):
+            explorer.search_many(["pkg/src", "."], max_workers=4)
+
+    def test_thread_pool_writes_caches_from_calling_thread(temp: TempDir):
+        temp.create_file("pkg-a/.foorc.yaml", "a: b")
+        temp.create_file("pkg-b/.foorc.yaml", "a: b")
+        writers = set()
+
+        class RecordingCache(dict):
+            def __setitem__(self, key, value):
+                writers.add(threading.current_thread())
+                super().__setitem__(key, value)
+
+        explorer = cosmiconfig(
+            "foo", stop_dir=str(temp.dir), cache=RecordingCache, intern_configs=True
+        )
+        results = explorer.search_many(["pkg-a", "pkg-b"], max_workers=4)
+
+        assert results["pkg-a"].config == {"a": "b"}
+        assert results["pkg-a"].config is results["pkg-b"].config
+        assert writers == {threading.current_thread()}
+
+
+def describe_search_all():
+    def test_returns_config_of_each_directory_nearest_first(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: root")
+        temp.create_file("pkg/pyproject.toml", '[tool.foo]\na = "pkg"')
+        temp.create_file("pkg/src/.foorc.json", '{"a": "src"}')
+        temp.create_dir("pkg/src/lib")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        results = explorer.search_all("pkg/src/lib")
+
+        assert [result.filepath for result in results] == [
+            str(temp.absolute_path("pkg/src/.foorc.json")),
+            str(temp.absolute_path("pkg/pyproject.toml")),
+            str(temp.absolute_path(".foorc.yaml")),
+        ]
+        assert explorer.search_all(str(temp.dir))[0] is results[-1]
+
+    def test_reads_shared_ancestors_once(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: root")
+        temp.create_dir("a")
+        temp.create_dir("b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        with patch.object(builtins, "open", wraps=builtins.open) as open_spy:
+            explorer.search_all("a")
+            explorer.search_all("b")
+
+            assert temp.get_spy_path_calls(open_spy) == [".foorc.yaml"]
+
+    def test_notices_changed_file(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: root")
+        temp.create_dir("a")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), validate_cache=True)
+
+        assert [result.config for result in explorer.search_all("a")] == [{"a": "root"}]
+        temp.create_file("a/.foorc.yaml", "a: a")
+        assert [result.config for result in explorer.search_all("a")] == [
+            {"a": "a"},
+            {"a": "root"},
+        ]
+
+
+def describe_search_merged():
+    def test_nearer_configs_override_farther_ones(temp: TempDir):
+        temp.create_file(
+            ".foorc.json", '{"a": 1, "nested": {"b": 2, "c": 3}, "items": [1, 2]}'
+        )
+        temp.create_file("pkg/.foorc.json", '{"nested": {"c": 4}, "items": [3]}')
+        temp.create_dir("pkg/src")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        result = explorer.search_merged("pkg/src")
+
+        assert result == CosmiconfigResult(
+            config={"a": 1, "nested": {"b": 2, "c": 4}, "items": [3]},
+            filepath=str(temp.absolute_path("pkg/.foorc.json")),
+        )
+
+    def test_siblings_share_merge_of_ancestors(temp: TempDir):
+        temp.create_file(".foorc.json", '{"shared": {"a": 1}, "b": 2}')
+        temp.create_file("pkg/.foorc.json", '{"b": 3}')
+        temp.create_file("pkg/a/.foorc.json", '{"name": "a"}')
+        temp.create_file("pkg/b/.foorc.json", '{"name": "b"}')
+        temp.create_dir("pkg/c")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        a = explorer.search_merged("pkg/a")
+        b = explorer.search_merged("pkg/b")
+        c = explorer.search_merged("pkg/c")
+
+        assert a.config == {"shared": {"a": 1}, "b": 3, "name": "a"}
+        assert b.config == {"shared": {"a": 1}, "b": 3, "name": "b"}
+        assert c is explorer.search_merged("pkg")
+        assert a.config["shared"] is c.config["shared"]
+        assert b.config["shared"] is c.config["shared"]
+
+    def test_does_not_change_configs_of_directories(temp: TempDir):
+        temp.create_file(".foorc.json", '{"nested": {"a": 1}}')
+        temp.create_file("pkg/.foorc.json", '{"nested": {"b": 2}}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir))
+
+        assert explorer.search_merged("pkg").config == {"nested": {"a": 1, "b": 2}}
+        assert [result.config for result in explorer.search_all("pkg")] == [
+            {"nested": {"b": 2}},
+            {"nested": {"a": 1}},
+        ]
+
+    def test_remerges_changed_ancestor(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": 1}')
+        temp.create_file("pkg/.foorc.json", '{"b": 2}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), validate_cache=True)
+
+        assert explorer.search_merged("pkg").config == {"a": 1, "b": 2}
+        temp.create_file(".foorc.json", '{"a": "changed"}')
+        assert explorer.search_merged("pkg").config == {"a": "changed", "b": 2}
+
+    def test_without_cache(temp: TempDir):
+        temp.create_file(".foorc.json", '{"a": 1}')
+        temp.create_file("pkg/.foorc.json", '{"b": 2}')
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), cache=False)
+
+        assert explorer.search_merged("pkg").config == {"a": 1, "b": 2}
+        assert explorer.search_merged("pkg/missing").config == {"a": 1, "b": 2}
+
+
+def describe_cosmiconfig_result():
+    def test_keeps_model_api():
+        result = CosmiconfigResult(config={"a": 1}, filepath="/foo/.foorc")
+
+        assert result.is_empty is None
+        assert result.dict() == {
+            "config": {"a": 1},
+            "filepath": "/foo/.foorc",
+            "is_empty": None,
+        }
+        assert dict(result) == result.dict()
+        assert result == CosmiconfigResult(config={"a": 1}, filepath="/foo/.foorc")
+        assert result != CosmiconfigResult(config={"a": 2}, filepath="/foo/.foorc")
+        assert result.copy(update={"is_empty": True}).is_empty is True
+        assert repr(result) == (
+            "CosmiconfigResult(config={'a': 1}, filepath='/foo/.foorc', is_empty=None)"
+        )
+
+    def test_requires_keyword_arguments():
+        with pytest.raises(TypeError):
+            CosmiconfigResult({"a": 1}, "/foo/.foorc")
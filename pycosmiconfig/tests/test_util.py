@@ -1,4 +1,8 @@
-from pycosmiconfig.port.util import get_property_by_path
+import random
+import pytest
+
+from pycosmiconfig import load_toml
+from pycosmiconfig.port.util import get_property_by_path, may_define_property
 
 source = {
     "ant": {
@@ -71,3 +75,101 @@ def describe_get_property_by_path():
                 is None
             )
             assert get_property_by_path(source, ["ant", "fancy.namez"]) is None
+
+
+# Documents that define `tool.foo`, in all the ways TOML allows to spell it
+defining_documents = [
+    "[tool.foo]\na = 1",
+    "[tool.foo]",
+    "[ tool . foo ]\na = 1",
+    '[tool."foo"]\na = 1',
+    "[tool.'foo']\na = 1",
+    '["tool".foo]\na = 1',
+    "[tool]\nfoo = { a = 1 }",
+    "[tool]\nfoo.a = 1",
+    "tool.foo.a = 1",
+    "tool = { foo = { a = 1 } }",
+    "[[tool.foo]]\na = 1",
+    "[tool.foo.bar]\na = 1",
+    '[tool."\\u0066oo"]\na = 1',
+    '[tool."\\U00000066oo"]\na = 1',
+    '"tool.foo" = { a = 1 }',
+]
+
+# Documents that don't define `tool.foo`, and whether they may (judging by
+# their text alone)
+other_documents = [
+    ("", False),
+    ("# comment", False),
+    ("[project]\nname = 'foo'", False),
+    ("[tool.bar]\na = 1", False),
+    ("[tool.fo]\no = 1", False),
+    ("[toolfoo]\na = 1", True),
+    ("[foo.tool]\na = 1", True),
+    ('description = "\\u0074ool"', True),
+]
+
+
+def parse_property(document: str, path):
+    return get_property_by_path(load_toml("pyproject.toml", document), path)
+
+
+def random_documents(count: int):
+    # Keys spelled as bare, quoted, literal or escaped keys, in headers,
+    # dotted keys and inline tables
+    rng = random.Random(0)
+    words = ["tool", "foo", "fo", "o", "bar", "tool.foo"]
+
+    def spell(word: str) -> str:
+        style = rng.randrange(4)
+        if style == 0 and "." not in word:
+            return word
+        if style == 1:
+            return f"'{word}'"
+        if style == 2:
+            return '"' + "".join(f"\\u{ord(char):04x}" for char in word) + '"'
+        return f'"{word}"'
+
+    for _ in range(count):
+        keys = [spell(rng.choice(words)) for _ in range(rng.randint(1, 3))]
+        key = ".".join(keys)
+        yield rng.choice(
+            [
+                f"[{key}]\na = 1",
+                f"{key} = 1",
+                f"{keys[0]} = {{ {'.'.join(keys[1:]) or 'a'} = 1 }}",
+            ]
+        )
+
+
+def describe_may_define_property():
+    @pytest.mark.parametrize(
+        "document, path",
+        [(document, "tool.foo") for document in defining_documents]
+        + [
+            (document, ["tool", "foo"])
+            for document in defining_documents
+            # Keys of list paths are never split
+            if not document.startswith('"tool.foo"')
+        ],
+    )
+    def test_never_rules_out_defined_properties(document: str, path):
+        assert parse_property(document, path) is not None
+        assert may_define_property(document, path)
+
+    @pytest.mark.parametrize("document, expected", other_documents)
+    def test_rules_out_missing_keys(document: str, expected: bool):
+        assert parse_property(document, "tool.foo") is None
+        assert may_define_property(document, "tool.foo") == expected
+
+    def test_agrees_with_parser_on_random_documents():
+        for document in random_documents(500):
+            for path in ["tool.foo", ["tool", "foo"], ["tool.foo"], ["foo", "o"]]:
+                if not may_define_property(document, path):
+                    assert parse_property(document, path) is None, document
+
+    def test_allows_keys_that_need_escapes():
+        document = '[tool."a\\"b"]\nc = 1'
+
+        assert parse_property(document, ["tool", 'a"b']) == {"c": 1}
+        assert may_define_property(document, ["tool", 'a"b'])
@@ -0,0 +1,185 @@
+import ctypes
+import errno
+import os
+import queue
+import time
+import pytest
+from unittest.mock import Mock
+
+from pycosmiconfig import ConfigChange, InotifyWatcher, PollingWatcher, cosmiconfig
+from util import TempDir
+
+
+def inotify_available() -> bool:
+    try:
+        InotifyWatcher(lambda directory, name: None).close()
+    except OSError:
+        return False
+    return True
+
+
+@pytest.fixture(autouse=True)
+def temp(monkeypatch):
+    monkeypatch.setattr(PollingWatcher, "interval", 0.01)
+
+    temp_dir = TempDir()
+    temp_dir.clean()
+    temp_dir.create_dir(".")
+
+    current_dir = os.getcwd()
+    os.chdir(temp_dir.dir)
+    yield temp_dir
+    os.chdir(current_dir)
+    temp_dir.delete_temp_dir()
+
+
+@pytest.fixture(
+    params=[
+        "polling",
+        pytest.param(
+            "inotify",
+            marks=pytest.mark.skipif(
+                not inotify_available(), reason="inotify not available"
+            ),
+        ),
+    ]
+)
+def watch_kind(request):
+    return request.param
+
+
+@pytest.fixture
+def changes():
+    return queue.Queue()
+
+
+@pytest.fixture
+def create_explorer(temp: TempDir, watch_kind: str, changes: queue.Queue):
+    explorers = []
+
+    def create_explorer(**options):
+        explorer = cosmiconfig(
+            "foo",
+            stop_dir=str(temp.dir),
+            watch=watch_kind,
+            on_change=changes.put,
+            **options,
+        )
+        explorers.append(explorer)
+        return explorer
+
+    yield create_explorer
+    for explorer in explorers:
+        explorer.close()
+
+
+def describe_watch():
+    def test_evicts_loaded_file_on_change(
+        temp: TempDir, create_explorer, changes: queue.Queue
+    ):
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = create_explorer()
+        file = str(temp.absolute_path(".foorc.yaml"))
+
+        first = explorer.load(file)
+        assert explorer.load(file) is first
+        temp.create_file(".foorc.yaml", "a: changed")
+
+        change: ConfigChange = changes.get(timeout=5)
+        assert change.path == file
+        assert change.loads == [file]
+        assert explorer.load(file).config == {"a": "changed"}
+
+    def test_evicts_searches_on_new_config_file(
+        temp: TempDir, create_explorer, changes: queue.Queue
+    ):
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_dir("a/b")
+        explorer = create_explorer()
+
+        assert explorer.search("a/b").config == {"a": "b"}
+        temp.create_file("a/.foorc.json", '{"a": "nearer"}')
+
+        change: ConfigChange = changes.get(timeout=5)
+        assert change.searches == [
+            str(temp.absolute_path("a")),
+            str(temp.absolute_path("a/b")),
+        ]
+        assert explorer.search("a/b").config == {"a": "nearer"}
+        assert explorer.search(".").config == {"a": "b"}
+
+    def test_evicts_searches_on_config_file_of_other_case(
+        temp: TempDir, create_explorer, changes: queue.Queue
+    ):
+        # Found on case-insensitive filesystems, see `is_place_listed()`
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_dir("a")
+        explorer = create_explorer()
+
+        explorer.search("a")
+        temp.create_file("a/.FOORC.json", '{"a": "nearer"}')
+
+        change: ConfigChange = changes.get(timeout=5)
+        assert change.searches == [str(temp.absolute_path("a"))]
+
+    def test_evicts_searches_on_deleted_config_file(
+        temp: TempDir, create_explorer, changes: queue.Queue
+    ):
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_file("a/.foorc.yaml", "a: nearer")
+        explorer = create_explorer()
+
+        assert explorer.search("a").config == {"a": "nearer"}
+        os.remove(temp.absolute_path("a/.foorc.yaml"))
+
+        changes.get(timeout=5)
+        assert explorer.search("a").config == {"a": "b"}
+
+    def test_ignores_unrelated_files(
+        temp: TempDir, create_explorer, changes: queue.Queue
+    ):
+        temp.create_file(".foorc.yaml", "a: b")
+        explorer = create_explorer()
+
+        result = explorer.search()
+        temp.create_file("unrelated.txt", "foo")
+        time.sleep(0.2)
+
+        assert changes.empty()
+        assert explorer.search() is result
+
+    def test_does_not_watch_without_cache(temp: TempDir, create_explorer):
+        explorer = create_explorer(cache=False)
+
+        assert explorer._watcher is None
+
+
+def _fail_add_watch(fd: int, path: bytes, mask: int) -> int:
+    ctypes.set_errno(errno.ENOSPC)
+    return -1
+
+
+@pytest.mark.skipif(not inotify_available(), reason="inotify not available")
+def describe_inotify_watch_failures():
+    def test_reports_paths_that_could_not_be_watched(temp: TempDir):
+        watcher = InotifyWatcher(lambda directory, name: None)
+        try:
+            # Creating the directory is reported by the watch of its parent
+            assert watcher.watch(str(temp.absolute_path("missing/.foorc.yaml")))
+            watcher._libc = Mock(inotify_add_watch=_fail_add_watch)
+            assert not watcher.watch(str(temp.dir))
+        finally:
+            watcher.close()
+
+    def test_validates_entries_that_could_not_be_watched(temp: TempDir):
+        temp.create_file(".foorc.yaml", "a: b")
+        temp.create_dir("a/b")
+        explorer = cosmiconfig("foo", stop_dir=str(temp.dir), watch="inotify")
+        explorer._watcher._libc = Mock(inotify_add_watch=_fail_add_watch)
+        try:
+            assert explorer.search("a/b").config == {"a": "b"}
+            temp.create_file("a/.foorc.json", '{"a": "nearer"}')
+
+            assert explorer.search("a/b").config == {"a": "nearer"}
+        finally:
+            explorer.close()
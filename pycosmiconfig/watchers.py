@@ -0,0 +1,304 @@
+import os
+import sys
+import threading
+from typing import TYPE_CHECKING, Callable, Dict, FrozenSet, Optional, Set, Tuple
+
+from pycosmiconfig.port.util import Fingerprint, get_fingerprint, list_dir
+
+# ctypes, select and struct are imported by the inotify watcher, when created
+if TYPE_CHECKING:
+    import ctypes
+
+WatchCallback = Callable[[str, Optional[str]], None]
+"""
+@public
+
+Called from the watcher's thread with `(directory, name)` when the entry
+`name` of `directory` was created, modified or deleted. `name` is `None`
+when the directory itself changed, or its events were lost.
+"""
+
+
+class Watcher:
+    """
+    @public
+
+    Base class of filesystem watchers. Watchers run their own daemon thread,
+    which calls `callback` on changes of the watched paths.
+    """
+
+    def __init__(self, callback: WatchCallback) -> None:
+        self._callback = callback
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def watch(self, path: str) -> bool:
+        """
+        Starts reporting changes of `path` (a file or a directory). Returns
+        `False` if changes of `path` can't be reported (e.g. the watcher is
+        closed, or ran out of resources to watch it).
+        """
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Stops the watcher thread. No callbacks are made after it returns."""
+        raise NotImplementedError
+
+    def _start(self) -> None:
+        # Must be called with the lock held
+        if self._thread is None and not self._closed:
+            self._thread = threading.Thread(
+                target=self._run, name=type(self).__name__, daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        raise NotImplementedError
+
+    def _notify(self, directory: str, name: Optional[str]) -> None:
+        # Errors of the callback must not stop the watcher thread
+        try:
+            self._callback(directory, name)
+        except Exception:
+            sys.excepthook(*sys.exc_info())
+
+
+# See `man 7 inotify`
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_MOVE_SELF = 0x00000800
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_WATCH_MASK = (
+    _IN_MODIFY
+    | _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_MOVE_SELF
+)
+
+
+def _load_libc() -> "ctypes.CDLL":
+    import ctypes
+    import ctypes.util
+
+    libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    # Raises AttributeError if the libc has no inotify (e.g. not Linux)
+    libc.inotify_init1.argtypes = [ctypes.c_int]
+    libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    return libc
+
+
+class InotifyWatcher(Watcher):
+    """
+    @public
+
+    Watcher using Linux inotify. Watches directories, so that files that are
+    created later are reported too. Raises `OSError` if inotify is not
+    available.
+    """
+
+    def __init__(self, callback: WatchCallback) -> None:
+        import ctypes
+        import struct
+
+        super().__init__(callback)
+        try:
+            self._libc = _load_libc()
+        except AttributeError as error:
+            raise OSError(f"inotify is not available: {error}") from error
+        self._event_header = struct.Struct("iIII")
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+        # Written to when closing, to wake the thread up
+        self._wakeup_read, self._wakeup_write = os.pipe()
+        self._dirs: Dict[str, int] = {}
+        self._watch_dirs: Dict[int, str] = {}
+
+    def watch(self, path: str) -> bool:
+        import ctypes
+        import errno
+
+        directory = path if os.path.isdir(path) else os.path.dirname(path)
+        with self._lock:
+            if self._closed:
+                return False
+            if directory in self._dirs:
+                return True
+            wd = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(directory), _IN_WATCH_MASK | _IN_ONLYDIR
+            )
+            if wd < 0:
+                # Directory doesn't exist (anymore), creating it is reported
+                # by the watch of its parent directory. Other errors (e.g.
+                # `ENOSPC` when the watch limit is reached, or `EACCES`) mean
+                # that its changes can't be reported.
+                return ctypes.get_errno() in (errno.ENOENT, errno.ENOTDIR)
+            self._dirs[directory] = wd
+            self._watch_dirs[wd] = directory
+            self._start()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            thread = self._thread
+        os.write(self._wakeup_write, b"\0")
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        os.close(self._fd)
+        os.close(self._wakeup_read)
+        os.close(self._wakeup_write)
+
+    def _run(self) -> None:
+        import select
+
+        while True:
+            readable, _, _ = select.select([self._fd, self._wakeup_read], [], [])
+            if self._wakeup_read in readable:
+                return
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except OSError:
+                return
+            for directory, name in self._parse_events(data):
+                self._notify(directory, name)
+
+    def _parse_events(self, data: bytes) -> Set[Tuple[str, Optional[str]]]:
+        # One write may cause several events, report each change once
+        changes: Set[Tuple[str, Optional[str]]] = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self._event_header.unpack_from(data, offset)
+            offset += self._event_header.size
+            name_end = offset + length
+            name = os.fsdecode(data[offset:name_end].rstrip(b"\0"))
+            offset = name_end
+
+            with self._lock:
+                if mask & _IN_Q_OVERFLOW:
+                    changes.update((directory, None) for directory in self._dirs)
+                    continue
+                directory = self._watch_dirs.get(wd, None)
+                if directory is None:
+                    continue
+                if mask & _IN_IGNORED:
+                    del self._watch_dirs[wd]
+                    if self._dirs.get(directory, None) == wd:
+                        del self._dirs[directory]
+                    continue
+            if mask & (_IN_DELETE_SELF | _IN_MOVE_SELF):
+                changes.add((directory, None))
+            else:
+                changes.add((directory, name or None))
+        return changes
+
+
+class PollingWatcher(Watcher):
+    """
+    @public
+
+    Watcher that compares the stat fingerprints of watched paths every
+    `interval` seconds. Works everywhere, but changes are noticed late and
+    each poll stats every watched path.
+    """
+
+    interval = 1.0
+
+    def __init__(
+        self, callback: WatchCallback, interval: Optional[float] = None
+    ) -> None:
+        super().__init__(callback)
+        if interval is not None:
+            self.interval = interval
+        self._stopped = threading.Event()
+        self._snapshots: Dict[
+            str, Tuple[Optional[Fingerprint], Optional[FrozenSet[str]]]
+        ] = {}
+
+    def watch(self, path: str) -> bool:
+        with self._lock:
+            if self._closed:
+                return False
+            if path not in self._snapshots:
+                self._snapshots[path] = self._snapshot(path)
+                self._start()
+        return True
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._stopped.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def _snapshot(
+        self, path: str
+    ) -> Tuple[Optional[Fingerprint], Optional[FrozenSet[str]]]:
+        # Directories are listed, so that the changed entries can be reported
+        listing = list_dir(path) if os.path.isdir(path) else None
+        return get_fingerprint(path), listing
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                paths = list(self._snapshots)
+            for path in paths:
+                for directory, name in self._poll(path):
+                    if self._stopped.is_set():
+                        return
+                    self._notify(directory, name)
+
+    def _poll(self, path: str) -> Set[Tuple[str, Optional[str]]]:
+        old_fingerprint, old_listing = self._snapshots[path]
+        fingerprint, listing = snapshot = self._snapshot(path)
+        if fingerprint == old_fingerprint:
+            return set()
+        with self._lock:
+            self._snapshots[path] = snapshot
+
+        changes: Set[Tuple[str, Optional[str]]] = set()
+        if old_listing is not None or listing is not None:
+            changed_names = (old_listing or frozenset()) ^ (listing or frozenset())
+            changes.update((path, name) for name in changed_names)
+        if old_listing is None or listing is None:
+            changes.add((os.path.dirname(path), os.path.basename(path)))
+        return changes
+
+
+def create_watcher(kind: str, callback: WatchCallback) -> Watcher:
+    """
+    @internal
+
+    Creates a watcher for the `watch` option: `"inotify"`, `"polling"`, or
+    `"auto"` (inotify if available, polling otherwise).
+    """
+    if kind == "polling":
+        return PollingWatcher(callback)
+    if kind == "inotify":
+        return InotifyWatcher(callback)
+    if kind == "auto":
+        try:
+            return InotifyWatcher(callback)
+        except OSError:
+            return PollingWatcher(callback)
+    raise ValueError(
+        f'watch must be a bool, "auto", "inotify" or "polling": Received "{kind}".'
+    )
@@ -0,0 +1,8 @@
+#!/usr/bin/env bash
+
+set -e
+set -x
+
+# Save results with `--benchmark-autosave`, and catch regressions against
+# the last saved run with `--benchmark-compare --benchmark-compare-fail=mean:10%`
+pytest pycosmiconfig/benchmarks --benchmark-only "${@}"